@@ -5,23 +5,84 @@ AI 기반 유튜브 대본 및 썸네일 제목 생성
 - 후킹 강한 썸네일 제목 생성
 """
 
+import asyncio
+import gzip
+import re
+import orjson
 import requests
-import json
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
 
+from http_pool import session_for_url
+from llm_cache import LLMCache
+
+# 이보다 큰 요청 본문만 gzip 압축 (작은 본문은 압축 이득이 없음)
+_GZIP_MIN_BYTES = 1024
+
+# "1. 제목" / "1) 제목" 형식의 번호 목록 한 줄
+_NUM_LINE_RE = re.compile(r'(?m)^[ \t]*\d+[.)][ \t]*(\S.*?)[ \t\r]*$')
+
+# "VIDEO_TITLE: ...", "DESCRIPTION: ...", "TAGS: ..." 형식의 메타데이터 한 줄
+_META_LINE_RE = re.compile(r'^(VIDEO_TITLE|DESCRIPTION|TAGS):[ \t]*(.*?)\s*$', re.M)
+_TAG_SPLIT_RE = re.compile(r'\s*,\s*')
+_META_KEYS = {'VIDEO_TITLE': 'title', 'DESCRIPTION': 'description', 'TAGS': 'tags'}
+
 class AIScriptGenerator:
-    def __init__(self, api_key: str = None, service: str = "openai"):
+    # 서비스별 기본 모델
+    DEFAULT_MODELS = {
+        "openai": "gpt-4o",  # 또는 gpt-4, gpt-3.5-turbo
+        "gemini": "gemini-2.5-flash",
+        "anthropic": "claude-3-5-sonnet-20241022"
+    }
+
+    def __init__(self, api_key: str = None, service: str = "openai",
+                 session: requests.Session = None, model: str = None,
+                 temperature: float = 0.7, cache_dir: Optional[str] = ".ai_cache",
+                 cache_ttl: int = 86400, compress_requests: bool = False):
         """
         service: "openai", "gemini", "anthropic" 중 선택
+        session: 모든 AI API 요청에 쓸 requests.Session (생략 시 공용 세션)
+        model: 사용할 모델 (생략 시 서비스별 기본 모델)
+        temperature: 생성 온도 (모든 서비스 요청에 전달되며 캐시 키에도 포함)
+        cache_dir: AI 응답 캐시 폴더 (None이면 캐시 사용 안 함)
+        cache_ttl: 캐시 유효 시간 (초)
+        compress_requests: 긴 요청 본문을 gzip으로 압축해 전송 (Content-Encoding: gzip을 받는 엔드포인트에서만 사용)
         """
         self.api_key = api_key
         self.service = service
+        self.model = model or self.DEFAULT_MODELS.get(service)
+        self.temperature = temperature
+        self.compress_requests = compress_requests
+
+        # 동일 프롬프트 재요청 방지용 디스크 캐시
+        self.cache = LLMCache(cache_dir, cache_ttl) if cache_dir else None
+
+        self.session = session
 
     def generate_youtube_script(self, article: Dict) -> Dict:
         """뉴스 기사를 유튜브 대본으로 변환"""
 
-        prompt = f"""
+        script = self._call_ai_api(self._build_script_prompt(article))
+
+        return {
+            'article_title': article['title'],
+            'script': script,
+            'estimated_duration': '8-10분',
+            'generated_at': datetime.now().isoformat()
+        }
+
+    def stream_youtube_script(self, article: Dict) -> Iterator[str]:
+        """유튜브 대본을 생성되는 대로 조각(str) 단위로 반환 (SSE 스트리밍)
+
+        전체 응답을 기다리지 않고 앞부분부터 후속 처리를 시작할 때 사용.
+        완성된 대본은 generate_youtube_script와 같은 캐시에 저장된다.
+        """
+        return self._stream_ai_api(self._build_script_prompt(article))
+
+    @staticmethod
+    def _build_script_prompt(article: Dict) -> str:
+        """대본 생성 프롬프트"""
+        return f"""
 당신은 시니어층(40~60대)을 대상으로 하는 유튜브 뉴스 채널의 전문 작가입니다.
 
 아래 뉴스 기사를 바탕으로 8~10분 분량의 유튜브 영상 대본을 작성해주세요.
@@ -49,15 +110,6 @@ class AIScriptGenerator:
 대본만 출력해주세요.
         """
 
-        script = self._call_ai_api(prompt)
-
-        return {
-            'article_title': article['title'],
-            'script': script,
-            'estimated_duration': '8-10분',
-            'generated_at': datetime.now().isoformat()
-        }
-
     def generate_thumbnail_titles(self, article: Dict, count: int = 10) -> List[str]:
         """CTR 높은 썸네일 제목 생성"""
 
@@ -79,12 +131,7 @@ class AIScriptGenerator:
         """
 
         response = self._call_ai_api(prompt)
-
-        # 응답에서 제목 리스트 추출
-        titles = [line.strip() for line in response.split('\n') if line.strip() and any(c.isdigit() for c in line[:3])]
-        titles = [title.split('.', 1)[-1].strip() if '.' in title[:5] else title for title in titles]
-
-        return titles[:count]
+        return self._parse_thumbnail_titles(response, count)
 
     def generate_video_metadata(self, article: Dict, script: str) -> Dict:
         """유튜브 영상 메타데이터 생성 (제목, 설명, 태그)"""
@@ -102,80 +149,282 @@ TAGS: [관련 태그 10개, 쉼표로 구분]
         """
 
         response = self._call_ai_api(prompt)
+        return self._parse_metadata(response)
+
+    def generate_all_in_one(self, article: Dict, thumbnail_count: int = 10) -> Dict:
+        """대본, 썸네일 제목, 메타데이터를 한 번의 AI 호출로 생성 (JSON 응답)
+
+        기사 본문을 한 번만 전송하고 왕복도 한 번으로 줄인다.
+        JSON 파싱에 실패하면 개별 호출 방식으로 대체한다.
+        """
+
+        prompt = f"""
+당신은 시니어층(40~60대)을 대상으로 하는 유튜브 뉴스 채널의 전문 작가입니다.
+
+아래 뉴스 기사를 바탕으로 유튜브 영상 대본, 썸네일 문구, 영상 메타데이터를 작성해주세요.
+
+[뉴스 기사]
+제목: {article['title']}
+내용: {article.get('description', '')}
+
+[1. 대본 (script)]
+- 8~10분 분량
+- 도입부 (30초): 강력한 후킹 멘트로 시작 (예: "여러분, 이거 아십니까?", "충격적인 소식입니다")
+- 본문 (7분): 기사 내용을 쉽고 자세하게 설명, 전문 용어는 풀어서 설명, 중간중간 시청자 몰입 유도 멘트 삽입
+- 마무리 (30초): 핵심 요약, 구독/좋아요/알림 설정 요청, 다음 영상 예고
+- 전달형, 존중하는 어조 ("여러분", "~입니다" 등 정중한 표현), 감정적 어필보다는 사실 중심
+
+[2. 썸네일 문구 (thumbnails)]
+- {thumbnail_count}개, 각 15자 이내
+- 충격, 궁금증 유발
+- 질문형/숫자형/충격형/반전형 등 다양한 스타일
+
+[3. 메타데이터 (metadata)]
+- title: 60자 이내 영상 제목
+- description: 200자 정도 영상 설명, 뉴스 출처 포함
+- tags: 관련 태그 10개
+
+Respond ONLY with valid JSON:
+{{"script": "...", "thumbnails": ["...", "..."], "metadata": {{"title": "...", "description": "...", "tags": ["...", "..."]}}}}
+        """
+
+        response = self._call_ai_api(prompt, json_mode=True)
+
+        try:
+            data = self._parse_json_response(response)
+            script = data['script']
+            thumbnails = data['thumbnails']
+            if isinstance(thumbnails, str):
+                # 목록 대신 번호 붙은 문자열로 오는 경우
+                thumbnails = self._parse_thumbnail_titles(thumbnails, thumbnail_count) or thumbnails.splitlines()
+            if not isinstance(thumbnails, list):
+                raise ValueError("thumbnails가 목록이 아님")
+            thumbnail_titles = [str(title).strip() for title in thumbnails if str(title).strip()][:thumbnail_count]
+            metadata = data['metadata']
+            if not isinstance(script, str) or not isinstance(metadata, dict):
+                raise ValueError("예상과 다른 JSON 구조")
+            # 업로드에 그대로 쓰이므로 필드 형식까지 확인 (tags는 "a, b" 문자열로 오는 경우가 있음)
+            if not isinstance(metadata.get('title'), str) or not isinstance(metadata.get('description'), str):
+                raise ValueError("메타데이터 title/description이 문자열이 아님")
+            tags = metadata.get('tags', [])
+            if isinstance(tags, str):
+                tags = [tag for tag in _TAG_SPLIT_RE.split(tags.strip()) if tag]
+            if not isinstance(tags, list):
+                raise ValueError("메타데이터 tags가 목록이 아님")
+            metadata['tags'] = [str(tag).strip() for tag in tags]
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"통합 응답 파싱 실패, 개별 생성으로 대체: {e}")
+            script_data = self.generate_youtube_script(article)
+            return {
+                'script_data': script_data,
+                'thumbnail_titles': self.generate_thumbnail_titles(article, thumbnail_count),
+                'metadata': self.generate_video_metadata(article, script_data['script'])
+            }
+
+        return {
+            'script_data': {
+                'article_title': article['title'],
+                'script': script,
+                'estimated_duration': '8-10분',
+                'generated_at': datetime.now().isoformat()
+            },
+            'thumbnail_titles': thumbnail_titles,
+            'metadata': metadata
+        }
 
-        # 응답 파싱
+    @staticmethod
+    def _parse_thumbnail_titles(response: str, count: int) -> List[str]:
+        """번호가 붙은 썸네일 제목 목록 파싱"""
+        return _NUM_LINE_RE.findall(response)[:count]
+
+    @staticmethod
+    def _parse_metadata(response: str) -> Dict:
+        """VIDEO_TITLE/DESCRIPTION/TAGS 형식의 메타데이터 파싱"""
         metadata = {}
-        for line in response.split('\n'):
-            if line.startswith('VIDEO_TITLE:'):
-                metadata['title'] = line.replace('VIDEO_TITLE:', '').strip()
-            elif line.startswith('DESCRIPTION:'):
-                metadata['description'] = line.replace('DESCRIPTION:', '').strip()
-            elif line.startswith('TAGS:'):
-                tags_str = line.replace('TAGS:', '').strip()
-                metadata['tags'] = [tag.strip() for tag in tags_str.split(',')]
+        for key, value in _META_LINE_RE.findall(response):
+            metadata[_META_KEYS[key]] = _TAG_SPLIT_RE.split(value) if key == 'TAGS' else value
 
         return metadata
 
-    def _call_ai_api(self, prompt: str) -> str:
-        """AI API 호출 (OpenAI, Gemini, Anthropic)"""
+    @staticmethod
+    def _parse_json_response(response: str) -> Dict:
+        """JSON 응답 파싱 (```json 코드 블록으로 감싼 경우 포함)"""
+        text = response.strip()
+        if text.startswith('```'):
+            text = text.split('\n', 1)[-1].rsplit('```', 1)[0]
+        return orjson.loads(text)
+
+    async def agenerate_youtube_script(self, article: Dict) -> Dict:
+        """generate_youtube_script 비동기 버전"""
+        return await asyncio.to_thread(self.generate_youtube_script, article)
+
+    async def agenerate_thumbnail_titles(self, article: Dict, count: int = 10) -> List[str]:
+        """generate_thumbnail_titles 비동기 버전"""
+        return await asyncio.to_thread(self.generate_thumbnail_titles, article, count)
+
+    async def agenerate_video_metadata(self, article: Dict, script: str) -> Dict:
+        """generate_video_metadata 비동기 버전"""
+        return await asyncio.to_thread(self.generate_video_metadata, article, script)
+
+    async def agenerate_all_in_one(self, article: Dict, thumbnail_count: int = 10) -> Dict:
+        """generate_all_in_one 비동기 버전"""
+        return await asyncio.to_thread(self.generate_all_in_one, article, thumbnail_count)
+
+    async def agenerate_all(self, article: Dict, thumbnail_count: int = 10) -> Dict:
+        """대본, 썸네일 제목, 메타데이터를 동시에 생성
+
+        메타데이터는 대본에 의존하므로 대본 완료 후 요청하고,
+        썸네일 제목은 대본/메타데이터 생성과 겹쳐서 실행한다.
+        """
+
+        async def script_and_metadata():
+            script_data = await self.agenerate_youtube_script(article)
+            metadata = await self.agenerate_video_metadata(article, script_data['script'])
+            return script_data, metadata
+
+        (script_data, metadata), thumbnail_titles = await asyncio.gather(
+            script_and_metadata(),
+            self.agenerate_thumbnail_titles(article, thumbnail_count)
+        )
+
+        return {
+            'script_data': script_data,
+            'thumbnail_titles': thumbnail_titles,
+            'metadata': metadata
+        }
+
+    def _call_ai_api(self, prompt: str, json_mode: bool = False) -> str:
+        """AI API 호출 (OpenAI, Gemini, Anthropic)
+
+        같은 서비스/모델/temperature/프롬프트 조합은 캐시된 응답을 재사용한다.
+        API 호출 실패 시 Mock 응답을 반환하며, 이 경우 캐시에 저장하지 않는다.
+        json_mode: JSON 객체만 응답하도록 요청 (서비스가 지원하는 경우)
+        """
+        if self.service not in self.DEFAULT_MODELS:
+            return self._call_mock(prompt)
+
+        cache_key = self._cache_key(prompt, json_mode)
+        cached = self.cache.get(cache_key) if self.cache else None
+        if cached is not None:
+            return cached
 
         if self.service == "openai":
-            return self._call_openai(prompt)
+            response = self._call_openai(prompt, json_mode)
         elif self.service == "gemini":
-            return self._call_gemini(prompt)
-        elif self.service == "anthropic":
-            return self._call_anthropic(prompt)
+            response = self._call_gemini(prompt, json_mode)
         else:
+            response = self._call_anthropic(prompt, json_mode)
+
+        if response is None:
             return self._call_mock(prompt)
 
-    def _call_openai(self, prompt: str) -> str:
-        """OpenAI GPT API 호출"""
+        if self.cache:
+            self.cache.set(cache_key, response)
+        return response
+
+    def _stream_ai_api(self, prompt: str) -> Iterator[str]:
+        """AI API 스트리밍 호출 (OpenAI, Gemini, Anthropic)
+
+        캐시 적중 시 캐시된 응답을 한 번에 반환한다. 첫 조각을 받기 전에
+        실패하면 Mock 응답을 반환하고, 도중에 끊기면 받은 부분까지만 반환한다.
+        정상적으로 끝난 응답만 캐시에 저장한다.
+        """
+        if self.service not in self.DEFAULT_MODELS:
+            yield self._call_mock(prompt)
+            return
+
+        cache_key = self._cache_key(prompt)
+        cached = self.cache.get(cache_key) if self.cache else None
+        if cached is not None:
+            yield cached
+            return
+
+        if self.service == "openai":
+            stream = self._stream_openai(prompt)
+        elif self.service == "gemini":
+            stream = self._stream_gemini(prompt)
+        else:
+            stream = self._stream_anthropic(prompt)
+
+        parts = []
+        try:
+            for text in stream:
+                parts.append(text)
+                yield text
+        except Exception as e:
+            print(f"AI API 스트리밍 실패: {e}")
+            if not parts:
+                yield self._call_mock(prompt)
+            return
+
+        if parts:
+            if self.cache:
+                self.cache.set(cache_key, ''.join(parts))
+        else:
+            yield self._call_mock(prompt)
+
+    @staticmethod
+    def _iter_sse(response: requests.Response) -> Iterator[Dict]:
+        """Server-Sent Events 응답의 data 이벤트를 JSON으로 변환하여 반환"""
+        for line in response.iter_lines():
+            if not line.startswith(b'data:'):
+                continue
+            payload = line[5:].strip()
+            if payload == b'[DONE]':
+                return
+            yield orjson.loads(payload)
+
+    def _cache_key(self, prompt: str, json_mode: bool = False) -> str:
+        """캐시 키: 서비스, 모델, temperature, 응답 형식, 프롬프트의 SHA-256"""
+        return LLMCache.make_key(self.service, self.model, self.temperature, json_mode, prompt)
+
+    def _post_json(self, url: str, headers: Dict, data: Dict, **kwargs) -> requests.Response:
+        """JSON 본문 POST (compress_requests가 켜져 있으면 긴 본문은 gzip 압축)"""
+        body = orjson.dumps(data)
+        if self.compress_requests and len(body) > _GZIP_MIN_BYTES:
+            body = gzip.compress(body)
+            headers = {**headers, "Content-Encoding": "gzip"}
+        return session_for_url(url, self.session).post(url, headers=headers, data=body, **kwargs)
+
+    def _openai_request(self, prompt: str, json_mode: bool = False,
+                        stream: bool = False) -> Tuple[str, Dict, Dict]:
+        """OpenAI GPT API 요청 (URL, 헤더, 본문)"""
         url = "https://api.openai.com/v1/chat/completions"
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
         data = {
-            "model": "gpt-4o",  # 또는 gpt-4, gpt-3.5-turbo
+            "model": self.model,
             "messages": [{"role": "user", "content": prompt}],
-            "temperature": 0.7,
-            "max_tokens": 2000
+            "temperature": self.temperature,
+            "max_tokens": 4000 if json_mode else 2000
         }
-
-        try:
-            response = requests.post(url, headers=headers, json=data, timeout=60)
-            if response.status_code == 200:
-                return response.json()['choices'][0]['message']['content']
-            else:
-                print(f"OpenAI API 오류: {response.status_code}")
-                return self._call_mock(prompt)
-        except Exception as e:
-            print(f"OpenAI API 호출 실패: {e}")
-            return self._call_mock(prompt)
-
-    def _call_gemini(self, prompt: str) -> str:
-        """Google Gemini API 호출"""
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={self.api_key}"
+        if json_mode:
+            data["response_format"] = {"type": "json_object"}
+        if stream:
+            data["stream"] = True
+        return url, headers, data
+
+    def _gemini_request(self, prompt: str, json_mode: bool = False,
+                        stream: bool = False) -> Tuple[str, Dict, Dict]:
+        """Google Gemini API 요청 (URL, 헤더, 본문)"""
+        method = "streamGenerateContent?alt=sse&" if stream else "generateContent?"
+        url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.model}:{method}key={self.api_key}"
         headers = {"Content-Type": "application/json"}
         data = {
             "contents": [{
                 "parts": [{"text": prompt}]
-            }]
+            }],
+            "generationConfig": {"temperature": self.temperature}
         }
+        if json_mode:
+            data["generationConfig"]["responseMimeType"] = "application/json"
+        return url, headers, data
 
-        try:
-            response = requests.post(url, headers=headers, json=data, timeout=60)
-            if response.status_code == 200:
-                return response.json()['candidates'][0]['content']['parts'][0]['text']
-            else:
-                print(f"Gemini API 오류: {response.status_code}")
-                return self._call_mock(prompt)
-        except Exception as e:
-            print(f"Gemini API 호출 실패: {e}")
-            return self._call_mock(prompt)
-
-    def _call_anthropic(self, prompt: str) -> str:
-        """Anthropic Claude API 호출"""
+    def _anthropic_request(self, prompt: str, json_mode: bool = False,
+                           stream: bool = False) -> Tuple[str, Dict, Dict]:
+        """Anthropic Claude API 요청 (URL, 헤더, 본문)"""
         url = "https://api.anthropic.com/v1/messages"
         headers = {
             "x-api-key": self.api_key,
@@ -183,25 +432,100 @@ TAGS: [관련 태그 10개, 쉼표로 구분]
             "content-type": "application/json"
         }
         data = {
-            "model": "claude-3-5-sonnet-20241022",
-            "max_tokens": 2000,
+            "model": self.model,
+            "max_tokens": 4000 if json_mode else 2000,
+            "temperature": self.temperature,
             "messages": [{"role": "user", "content": prompt}]
         }
+        if json_mode:
+            # 응답 앞부분을 "{"로 채워 JSON 객체로 시작하도록 유도
+            data["messages"].append({"role": "assistant", "content": "{"})
+        if stream:
+            data["stream"] = True
+        return url, headers, data
+
+    def _call_openai(self, prompt: str, json_mode: bool = False) -> Optional[str]:
+        """OpenAI GPT API 호출 (실패 시 None)"""
+        try:
+            response = self._post_json(*self._openai_request(prompt, json_mode), timeout=60)
+            if response.status_code == 200:
+                return orjson.loads(response.content)['choices'][0]['message']['content']
+            else:
+                print(f"OpenAI API 오류: {response.status_code}")
+                return None
+        except Exception as e:
+            print(f"OpenAI API 호출 실패: {e}")
+            return None
 
+    def _call_gemini(self, prompt: str, json_mode: bool = False) -> Optional[str]:
+        """Google Gemini API 호출 (실패 시 None)"""
         try:
-            response = requests.post(url, headers=headers, json=data, timeout=60)
+            response = self._post_json(*self._gemini_request(prompt, json_mode), timeout=60)
             if response.status_code == 200:
-                return response.json()['content'][0]['text']
+                return orjson.loads(response.content)['candidates'][0]['content']['parts'][0]['text']
+            else:
+                print(f"Gemini API 오류: {response.status_code}")
+                return None
+        except Exception as e:
+            print(f"Gemini API 호출 실패: {e}")
+            return None
+
+    def _call_anthropic(self, prompt: str, json_mode: bool = False) -> Optional[str]:
+        """Anthropic Claude API 호출 (실패 시 None)"""
+        try:
+            response = self._post_json(*self._anthropic_request(prompt, json_mode), timeout=60)
+            if response.status_code == 200:
+                text = orjson.loads(response.content)['content'][0]['text']
+                return "{" + text if json_mode else text
             else:
                 print(f"Anthropic API 오류: {response.status_code}")
-                return self._call_mock(prompt)
+                return None
         except Exception as e:
             print(f"Anthropic API 호출 실패: {e}")
-            return self._call_mock(prompt)
+            return None
+
+    def _stream_openai(self, prompt: str) -> Iterator[str]:
+        """OpenAI GPT API 스트리밍 호출"""
+        with self._post_json(*self._openai_request(prompt, stream=True), timeout=60, stream=True) as response:
+            if response.status_code != 200:
+                raise RuntimeError(f"OpenAI API 오류: {response.status_code}")
+            for event in self._iter_sse(response):
+                choices = event.get('choices') or [{}]
+                text = choices[0].get('delta', {}).get('content')
+                if text:
+                    yield text
+
+    def _stream_gemini(self, prompt: str) -> Iterator[str]:
+        """Google Gemini API 스트리밍 호출"""
+        with self._post_json(*self._gemini_request(prompt, stream=True), timeout=60, stream=True) as response:
+            if response.status_code != 200:
+                raise RuntimeError(f"Gemini API 오류: {response.status_code}")
+            for event in self._iter_sse(response):
+                for candidate in event.get('candidates', [])[:1]:
+                    for part in candidate.get('content', {}).get('parts', []):
+                        if part.get('text'):
+                            yield part['text']
+
+    def _stream_anthropic(self, prompt: str) -> Iterator[str]:
+        """Anthropic Claude API 스트리밍 호출"""
+        with self._post_json(*self._anthropic_request(prompt, stream=True), timeout=60, stream=True) as response:
+            if response.status_code != 200:
+                raise RuntimeError(f"Anthropic API 오류: {response.status_code}")
+            for event in self._iter_sse(response):
+                if event.get('type') == 'content_block_delta':
+                    text = event.get('delta', {}).get('text')
+                    if text:
+                        yield text
 
     def _call_mock(self, prompt: str) -> str:
         """Mock 응답 (테스트용)"""
-        if "썸네일" in prompt or "제목" in prompt:
+        if '"thumbnails"' in prompt:
+            return orjson.dumps({
+                'script': self._call_mock("").strip(),
+                'thumbnails': self._parse_thumbnail_titles(self._call_mock("썸네일"), 10),
+                'metadata': self._parse_metadata(self._call_mock("메타데이터"))
+            }).decode()
+        elif "썸네일" in prompt or "제목" in prompt:
             return """
 1. 이거 실화인가요?
 2. 충격! 00억 날렸다
@@ -275,6 +599,6 @@ if __name__ == "__main__":
         'metadata': metadata
     }
 
-    with open('generated_content.json', 'w', encoding='utf-8') as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
+    with open('generated_content.json', 'wb') as f:
+        f.write(orjson.dumps(output, option=orjson.OPT_INDENT_2))
     print("\n💾 generated_content.json 저장 완료")
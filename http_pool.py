@@ -0,0 +1,57 @@
+"""
+HTTP 연결 풀
+- 호스트별 requests.Session 재사용 (keep-alive, TLS 핸드셰이크 절약)
+- 429/5xx 응답은 지수 백오프로 자동 재시도 (Retry-After 헤더 준수)
+"""
+
+import threading
+from typing import Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+_sessions = {}
+_lock = threading.Lock()
+
+# 호스트별 재시도 정책 (기본값과 다르게 쓸 호스트만)
+# TTS는 분할된 조각을 동시에 요청하면 429가 자주 나고, 실패 시 Mock으로 대체되므로 더 오래 재시도
+# (연결 실패와 429/5xx 응답만 재시도. 응답 대기 중 타임아웃은 합성이 중복 청구되므로 재시도하지 않음)
+_RETRY_OVERRIDES = {
+    'api.elevenlabs.io': {'total': 5, 'backoff_factor': 1.0, 'read': 0},
+    'koreacentral.tts.speech.microsoft.com': {'total': 5, 'backoff_factor': 1.0, 'read': 0},
+}
+
+
+def _build_session(total: int = 3, backoff_factor: float = 0.5, read: int = 0) -> requests.Session:
+    """재시도 정책과 연결 풀이 설정된 세션 생성"""
+    retry = Retry(
+        total=total,
+        backoff_factor=backoff_factor,  # 기본값 기준 0.5초, 1초, 2초 대기
+        read=read,  # 기본 0: 응답 대기 중 타임아웃은 재시도하지 않음 (POST가 다시 전송되어 생성 비용이 중복 청구됨)
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset(['GET', 'POST']),
+        raise_on_status=False  # 재시도 후에도 실패하면 마지막 응답을 그대로 반환
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retry)
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session(host: str) -> requests.Session:
+    """호스트별 공용 세션 반환 (처음 요청 시 생성)"""
+    with _lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = _sessions[host] = _build_session(**_RETRY_OVERRIDES.get(host, {}))
+        return session
+
+
+def session_for_url(url: str, override: Optional[requests.Session] = None) -> requests.Session:
+    """요청에 사용할 세션 반환
+    override(호출 측에서 직접 지정한 세션)가 있으면 그대로 쓰고, 없으면 URL 호스트의 공용 세션 사용"""
+    return override or get_session(urlparse(url).netloc)
@@ -0,0 +1,79 @@
+"""
+AI 응답 디스크 캐시
+- 서비스/모델/설정/프롬프트의 SHA-256을 키로 응답 텍스트를 JSON 파일로 저장
+- 같은 프롬프트를 다시 요청하면 API를 호출하지 않고 캐시된 응답 사용
+"""
+
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import orjson
+
+
+class LLMCache:
+    def __init__(self, cache_dir: str = ".ai_cache", ttl: int = 86400):
+        """
+        cache_dir: 캐시 파일 저장 폴더
+        ttl: 캐시 유효 시간 (초)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self._last_prune = 0.0
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """캐시 키: 구성 요소(서비스, 모델, temperature, 프롬프트 등)를 이어 붙인 문자열의 SHA-256"""
+        raw = '|'.join(str(part) for part in parts)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """캐시 조회 (없거나 만료되었으면 None)"""
+        cache_file = self.cache_dir / f"{key}.json"
+        try:
+            with open(cache_file, 'rb') as f:
+                entry = orjson.loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - entry.get('created_at', 0) > self.ttl:
+            # 만료된 항목은 바로 삭제 (주기적으로 실행해도 캐시 폴더가 계속 커지지 않도록)
+            try:
+                cache_file.unlink()
+            except OSError:
+                pass
+            return None
+        return entry.get('response')
+
+    def set(self, key: str, response: str):
+        """캐시 저장 (동시 실행 중 깨진 파일이 읽히지 않도록 임시 파일 후 교체)"""
+        cache_file = self.cache_dir / f"{key}.json"
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_file, 'wb') as f:
+                f.write(orjson.dumps({'created_at': time.time(), 'response': response}))
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            print(f"AI 응답 캐시 저장 실패: {e}")
+            return
+
+        # 다시 조회되지 않는 프롬프트(매번 바뀌는 기사 등)의 만료 항목도 정리 (최대 1시간에 한 번)
+        if time.time() - self._last_prune > min(self.ttl, 3600):
+            self.prune()
+
+    def prune(self):
+        """만료된 캐시 파일 삭제 (파일 수정 시각 기준)"""
+        self._last_prune = now = time.time()
+        try:
+            for cache_file in self.cache_dir.glob('*.json'):
+                try:
+                    if now - cache_file.stat().st_mtime > self.ttl:
+                        cache_file.unlink()
+                except OSError:
+                    pass
+        except OSError as e:
+            print(f"AI 응답 캐시 정리 실패: {e}")
@@ -1,10 +1,14 @@
 """
 뉴스 기반 유튜브 자동화 - 통합 워크플로우
-모든 단계를 순차적으로 실행하는 메인 스크립트
+모든 단계를 실행하는 메인 스크립트 (기사별 제작 과정은 동시에 처리)
 """
 
-import json
+import asyncio
+import orjson
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import cached_property
 from pathlib import Path
 
 from news_collector import NewsCollector
@@ -28,23 +32,40 @@ class NewsYouTubeAutomation:
         """
         self.config = config or self._default_config()
         self.output_dir = Path("output")
-        self.output_dir.mkdir(exist_ok=True)
-
-        # 각 모듈 초기화
-        self.news_collector = NewsCollector()
-        self.news_collector.keywords = self.config['keywords']
-
-        self.ai_generator = AIScriptGenerator(
+        self.audio_dir = self.output_dir / "audio"
+        self.video_dir = self.output_dir / "videos"
+        for directory in (self.output_dir, self.audio_dir, self.video_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+
+        # YouTube API 클라이언트는 스레드 간 공유가 안전하지 않으므로 업로드는 한 번에 하나씩
+        self._upload_lock = threading.Lock()
+
+    # 각 모듈은 처음 사용할 때 한 번만 생성하여 워크플로우를 반복 실행해도 재사용
+    # (HTTP 연결은 http_pool의 공용 세션으로 유지됨)
+    @cached_property
+    def news_collector(self) -> NewsCollector:
+        news_collector = NewsCollector()
+        news_collector.keywords = self.config['keywords']
+        return news_collector
+
+    @cached_property
+    def ai_generator(self) -> AIScriptGenerator:
+        return AIScriptGenerator(
             api_key=self.config.get('ai_api_key'),
             service=self.config.get('ai_service', 'mock')
         )
 
-        self.tts_generator = TTSGenerator(
+    @cached_property
+    def tts_generator(self) -> TTSGenerator:
+        return TTSGenerator(
             service=self.config.get('tts_service', 'mock'),
-            api_key=self.config.get('tts_api_key')
+            api_key=self.config.get('tts_api_key'),
+            output_dir=str(self.audio_dir)
         )
 
-        self.youtube_uploader = YouTubeUploader(
+    @cached_property
+    def youtube_uploader(self) -> YouTubeUploader:
+        return YouTubeUploader(
             credentials_file=self.config.get('youtube_credentials', 'client_secrets.json')
         )
 
@@ -55,7 +76,9 @@ class NewsYouTubeAutomation:
             'ai_service': 'mock',
             'tts_service': 'mock',
             'news_count': 20,
-            'target_videos_per_day': 3
+            'target_videos_per_day': 3,
+            'max_concurrent': 3,
+            'ai_single_call': True
         }
 
     def run_full_workflow(self, auto_upload: bool = False):
@@ -77,15 +100,26 @@ class NewsYouTubeAutomation:
         print("\n🎯 [2/6] 영상 제작할 기사 선택...")
         selected_articles = self._step2_select_articles(articles)
 
-        # 3~6단계: 각 기사별로 영상 제작
-        results = []
-        for i, article in enumerate(selected_articles, 1):
-            print(f"\n{'='*70}")
-            print(f"📹 기사 {i}/{len(selected_articles)}: {article['title']}")
-            print(f"{'='*70}")
+        # 3단계: 모든 기사의 AI 콘텐츠를 동시에 생성
+        print("\n✍️ [3/6] AI 대본/썸네일/메타데이터 동시 생성 중...")
+        contents = asyncio.run(self._generate_contents(selected_articles))
 
-            result = self._process_single_article(article, auto_upload)
-            results.append(result)
+        # 4~6단계: 각 기사별 영상 제작을 동시에 실행
+        # 여러 스레드의 출력이 섞이므로 한 줄로 출력하고 단계 메시지에는 기사 번호를 붙인다
+        def process(i: int, article: dict, content: dict) -> dict:
+            print(f"\n📹 [{i}/{len(selected_articles)}] 제작 시작: {article['title']}")
+            return self._process_single_article(article, auto_upload, content, index=i)
+
+        results = []
+        if selected_articles:
+            # cached_property는 Python 3.12부터 잠금이 없어 여러 스레드가 동시에 접근하면
+            # TTSGenerator가 중복 생성될 수 있으므로 스레드 시작 전에 한 번 생성해 둔다
+            self.tts_generator
+            max_workers = min(len(selected_articles), self.config.get('max_concurrent', 3))
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                results = list(executor.map(
+                    process, range(1, len(selected_articles) + 1), selected_articles, contents
+                ))
 
         # 최종 결과 출력
         workflow_end = datetime.now()
@@ -109,10 +143,18 @@ class NewsYouTubeAutomation:
     def _step1_collect_news(self) -> list:
         """1단계: 뉴스 수집"""
         raw_articles = self.news_collector.collect_all_news()
-        trending_articles = self.news_collector.filter_trending_news(raw_articles)
+        trending_articles = self.news_collector.filter_trending_news(
+            raw_articles, limit=self.config.get('news_count')
+        )
 
         print(f"✅ {len(trending_articles)}개 트렌드 기사 수집 완료")
 
+        # 상위 기사 본문 스크래핑 (선택, 동시 실행)
+        scrape_top_n = self.config.get('scrape_top_n', 0)
+        if scrape_top_n:
+            print(f"📄 상위 {scrape_top_n}개 기사 본문 수집 중...")
+            self.news_collector.scrape_articles_content(trending_articles[:scrape_top_n])
+
         # JSON 저장
         self.news_collector.save_to_json(
             trending_articles,
@@ -132,84 +174,121 @@ class NewsYouTubeAutomation:
 
         return selected
 
-    def _process_single_article(self, article: dict, auto_upload: bool) -> dict:
-        """단일 기사에 대한 영상 제작 프로세스"""
+    async def _generate_contents(self, articles: list) -> list:
+        """3단계: 기사별 AI 콘텐츠 동시 생성 (max_concurrent로 동시 처리 수 제한)"""
+        semaphore = asyncio.Semaphore(self.config.get('max_concurrent', 3))
+
+        async def generate(article: dict) -> dict:
+            async with semaphore:
+                return await self._agenerate_content(article)
+
+        # 개별 기사 실패가 전체 워크플로우를 중단시키지 않도록 예외도 결과로 받는다
+        return await asyncio.gather(
+            *[generate(article) for article in articles],
+            return_exceptions=True
+        )
+
+    async def _agenerate_content(self, article: dict) -> dict:
+        """기사 하나의 AI 콘텐츠 생성 (기본: 한 번의 통합 호출, ai_single_call=False면 개별 호출)"""
+        if self.config.get('ai_single_call', True):
+            return await self.ai_generator.agenerate_all_in_one(article, thumbnail_count=10)
+        return await self.ai_generator.agenerate_all(article, thumbnail_count=10)
+
+    def _process_single_article(self, article: dict, auto_upload: bool,
+                                content: dict = None, index: int = None) -> dict:
+        """단일 기사에 대한 영상 제작 프로세스
+
+        content: _generate_contents로 미리 생성한 AI 콘텐츠 (없으면 여기서 생성)
+        index: 동시에 처리되는 기사 번호 (같은 초에 시작해도 파일명이 겹치지 않도록 사용, 출력 메시지에도 표시)
+        """
+        tag = f"[{index}] " if index is not None else ""
+
+        # 기사별 시각을 한 번만 구해 결과 기록과 음성/영상 파일명에 함께 사용
+        started_at = datetime.now()
+        stamp = started_at.strftime('%Y%m%d_%H%M%S')
+        if index is not None:
+            stamp = f"{stamp}_{index}"
 
         result = {
             'article_title': article['title'],
             'status': 'processing',
-            'timestamp': datetime.now().isoformat()
+            'timestamp': started_at.isoformat()
         }
 
         try:
-            # 3단계: AI 대본 생성
-            print("\n  ✍️ [3/6] AI 대본 생성 중...")
-            script_data = self.ai_generator.generate_youtube_script(article)
+            # 3단계: AI 대본/썸네일/메타데이터
+            if content is None:
+                print(f"  {tag}✍️ [3/6] AI 대본/썸네일/메타데이터 생성 중...")
+                content = asyncio.run(self._agenerate_content(article))
+            if isinstance(content, Exception):
+                raise content
+
+            script_data = content['script_data']
             script = script_data['script']
-            print(f"  ✅ 대본 생성 완료 (예상 {script_data['estimated_duration']})")
+            print(f"  {tag}✅ 대본 생성 완료 (예상 {script_data['estimated_duration']})")
             result['script'] = script
 
-            # 썸네일 제목 생성
-            print("\n  🎨 [3.5/6] 썸네일 제목 생성 중...")
-            thumbnail_titles = self.ai_generator.generate_thumbnail_titles(article, count=10)
+            thumbnail_titles = content['thumbnail_titles']
             best_title = thumbnail_titles[0] if thumbnail_titles else article['title']
-            print(f"  ✅ 썸네일 제목: {best_title}")
+            print(f"  {tag}✅ 썸네일 제목: {best_title}")
             result['thumbnail_title'] = best_title
 
-            # 메타데이터 생성
-            metadata = self.ai_generator.generate_video_metadata(article, script)
+            metadata = content['metadata']
             result['metadata'] = metadata
 
             # 4단계: TTS 음성 생성
-            print("\n  🎤 [4/6] TTS 음성 생성 중...")
+            print(f"  {tag}🎤 [4/6] TTS 음성 생성 중...")
             tts_result = self.tts_generator.generate_audio(
                 text=script,
                 voice_style="professional",
-                output_filename=f"voice_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp3"
+                output_filename=f"voice_{stamp}.mp3"
             )
-            print(f"  ✅ 음성 생성 완료: {tts_result['output_file']}")
+            print(f"  {tag}✅ 음성 생성 완료: {tts_result['output_file']}")
             result['audio_file'] = tts_result['output_file']
 
             # 5단계: 영상 편집 (Vrew 연동 등 - 여기서는 Mock)
-            print("\n  🎬 [5/6] 영상 편집 중...")
-            video_file = self._step5_edit_video(tts_result['output_file'], script)
-            print(f"  ✅ 영상 편집 완료: {video_file}")
+            print(f"  {tag}🎬 [5/6] 영상 편집 중...")
+            video_file = self._step5_edit_video(tts_result['output_file'], script, stamp)
+            print(f"  {tag}✅ 영상 편집 완료: {video_file}")
             result['video_file'] = video_file
 
             # 6단계: 유튜브 업로드
             if auto_upload:
-                print("\n  📤 [6/6] 유튜브 업로드 중...")
-                upload_result = self.youtube_uploader.upload_video(
-                    video_file=video_file,
-                    title=metadata.get('title', article['title']),
-                    description=metadata.get('description', ''),
-                    tags=metadata.get('tags', []),
-                    category_id="25",  # News & Politics
-                    privacy_status="public"
-                )
-                print(f"  ✅ 업로드 완료: {upload_result.get('video_url', 'N/A')}")
+                print(f"  {tag}📤 [6/6] 유튜브 업로드 중...")
+                with self._upload_lock:
+                    upload_result = self.youtube_uploader.upload_video(
+                        video_file=video_file,
+                        title=metadata.get('title', article['title']),
+                        description=metadata.get('description', ''),
+                        tags=metadata.get('tags', []),
+                        category_id="25",  # News & Politics
+                        privacy_status="public"
+                    )
+                print(f"  {tag}✅ 업로드 완료: {upload_result.get('video_url', 'N/A')}")
                 result['video_url'] = upload_result.get('video_url')
                 result['video_id'] = upload_result.get('video_id')
             else:
-                print("\n  ⏸️  [6/6] 자동 업로드 비활성화됨 (수동 업로드 필요)")
+                print(f"  {tag}⏸️  [6/6] 자동 업로드 비활성화됨 (수동 업로드 필요)")
 
             result['status'] = 'completed'
 
         except Exception as e:
-            print(f"  ❌ 오류 발생: {e}")
+            print(f"  {tag}❌ 오류 발생: {e}")
             result['status'] = 'failed'
             result['error'] = str(e)
 
         return result
 
-    def _step5_edit_video(self, audio_file: str, script: str) -> str:
-        """5단계: 영상 편집 (Mock)"""
+    def _step5_edit_video(self, audio_file: str, script: str, stamp: str = None) -> str:
+        """5단계: 영상 편집 (Mock)
+
+        stamp: 파일명에 사용할 시각 문자열 (음성 파일과 같은 값을 넘겨 짝을 맞춤)
+        """
         # 실제로는 Vrew, Premiere 등 편집 소프트웨어 API 연동
         # 또는 FFmpeg, MoviePy 등으로 자동 편집
 
-        video_filename = f"video_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp4"
-        video_path = self.output_dir / "videos" / video_filename
-        video_path.parent.mkdir(parents=True, exist_ok=True)
+        stamp = stamp or datetime.now().strftime('%Y%m%d_%H%M%S')
+        video_path = self.video_dir / f"video_{stamp}.mp4"
 
         # Mock 비디오 파일 생성
         with open(video_path, 'w', encoding='utf-8') as f:
@@ -219,14 +298,15 @@ class NewsYouTubeAutomation:
 
     def _save_workflow_results(self, results: list):
         """워크플로우 결과 저장"""
-        output_file = self.output_dir / f"workflow_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        now = datetime.now()
+        output_file = self.output_dir / f"workflow_results_{now.strftime('%Y%m%d_%H%M%S')}.json"
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                'timestamp': datetime.now().isoformat(),
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps({
+                'timestamp': now.isoformat(),
                 'total_videos': len(results),
                 'results': results
-            }, f, ensure_ascii=False, indent=2)
+            }, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
 
         print(f"\n💾 결과 저장: {output_file}")
 
@@ -248,7 +328,8 @@ if __name__ == "__main__":
         'tts_service': 'mock',  # 'elevenlabs', 'google', 'azure'
         'tts_api_key': None,
         'youtube_credentials': 'client_secrets.json',
-        'target_videos_per_day': 3
+        'target_videos_per_day': 3,
+        'max_concurrent': 3  # 동시에 AI 콘텐츠를 생성할 기사 수 (API 속도 제한 고려)
     }
 
     # 자동화 시스템 초기화
@@ -5,20 +5,67 @@
 """
 
 import requests
-from bs4 import BeautifulSoup
 import feedparser
+import lxml.html
+from lxml import etree
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import json
+from itertools import chain
+import heapq
+from html import unescape
+import orjson
+import re
 from typing import List, Dict
 
+from http_pool import session_for_url
+
+# HTML 태그 제거용 정규식
+_TAG_RE = re.compile(r'<[^>]+>', re.DOTALL)
+
+# 기사 본문 탐색 XPath (우선순위 순: article, .article_body, #articleBodyContents, .news_end)
+_ARTICLE_XPATHS = tuple(etree.XPath(expr) for expr in (
+    '//article',
+    '//*[contains(concat(" ", normalize-space(@class), " "), " article_body ")]',
+    '//*[@id="articleBodyContents"]',
+    '//*[contains(concat(" ", normalize-space(@class), " "), " news_end ")]',
+))
+
+# Content-Type 헤더의 charset
+_CHARSET_RE = re.compile(r'charset=["\']?([\w.-]+)', re.I)
+
+_SCRAPE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
 class NewsCollector:
-    def __init__(self):
+    def __init__(self, session: requests.Session = None):
+        """
+        session: 뉴스 API/기사 본문 요청에 쓸 requests.Session (생략 시 공용 세션)
+        """
         self.keywords = [
             "삼성", "현대", "쿠팡", "배달", "부동산",
             "주식", "경제", "정책", "손흥민", "AI"
         ]
         self.collected_news = []
 
+        self.session = session
+
+    @property
+    def keywords(self) -> List[str]:
+        return self._keywords
+
+    @keywords.setter
+    def keywords(self, keywords: List[str]):
+        """키워드 설정 시 매칭용 정규식도 함께 컴파일
+
+        전방탐색으로 모든 위치에서 그 위치에서 시작하는 가장 긴 키워드를 찾고,
+        찾은 키워드에 포함된 다른 키워드(예: '삼성전자' 안의 '삼성')도 함께 센다.
+        """
+        self._keywords = keywords
+        lowered = sorted({k.lower() for k in keywords if k}, key=len, reverse=True)
+        self._kw_re = re.compile(f"(?=({'|'.join(map(re.escape, lowered))}))") if lowered else None
+        self._kw_contained = {kw: frozenset(k for k in lowered if k in kw) for kw in lowered}
+
     def fetch_naver_news(self, keyword: str, max_results: int = 10) -> List[Dict]:
         """네이버 뉴스 검색 API를 통한 뉴스 수집"""
         # 실제 구현 시 네이버 API 키 필요
@@ -34,30 +81,32 @@ class NewsCollector:
         }
 
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=10)
+            response = session_for_url(url, self.session).get(url, headers=headers, params=params, timeout=10)
             if response.status_code == 200:
-                data = response.json()
-                articles = []
-                for item in data.get('items', []):
-                    articles.append({
-                        'title': self._clean_html(item['title']),
-                        'description': self._clean_html(item['description']),
-                        'link': item['link'],
-                        'pub_date': item['pubDate'],
-                        'keyword': keyword,
-                        'source': 'naver'
-                    })
-                return articles
+                data = orjson.loads(response.content)
+                # 제목/설명의 <b> 태그와 HTML 엔티티 제거
+                return [{
+                    'title': unescape(_TAG_RE.sub('', item['title'])).strip(),
+                    'description': unescape(_TAG_RE.sub('', item['description'])).strip(),
+                    'link': item['link'],
+                    'pub_date': item['pubDate'],
+                    'keyword': keyword,
+                    'source': 'naver'
+                } for item in data.get('items', [])]
         except Exception as e:
             print(f"네이버 뉴스 수집 오류 ({keyword}): {e}")
         return []
 
     def fetch_google_news_rss(self, keyword: str) -> List[Dict]:
         """Google News RSS를 통한 뉴스 수집 (API 키 불필요)"""
-        url = f"https://news.google.com/rss/search?q={keyword}&hl=ko&gl=KR&ceid=KR:ko"
+        url = "https://news.google.com/rss/search"
+        params = {"q": keyword, "hl": "ko", "gl": "KR", "ceid": "KR:ko"}
 
         try:
-            feed = feedparser.parse(url)
+            # feedparser가 직접 다운로드하면 연결 재사용이 안 되므로 세션으로 받아서 넘긴다
+            response = session_for_url(url, self.session).get(url, params=params, timeout=10)
+            response.raise_for_status()
+            feed = feedparser.parse(response.content, response_headers=dict(response.headers))
             articles = []
             for entry in feed.entries[:10]:
                 articles.append({
@@ -76,23 +125,26 @@ class NewsCollector:
     def scrape_article_content(self, url: str) -> str:
         """기사 본문 스크래핑"""
         try:
-            response = requests.get(url, timeout=10, headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            })
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # 응답 본문을 bytes로 복사하지 않고 lxml(C 파서)에 바로 스트리밍
+            with session_for_url(url, self.session).get(url, headers=_SCRAPE_HEADERS, timeout=10,
+                                                         stream=True) as response:
+                response.raw.decode_content = True
+                # 헤더에 charset이 있으면 사용, 없으면 lxml이 <meta charset>으로 판별
+                charset = _CHARSET_RE.search(response.headers.get('Content-Type', ''))
+                parser = lxml.html.HTMLParser(encoding=charset.group(1) if charset else None)
+                root = lxml.html.parse(response.raw, parser).getroot()
+
+            if root is None:
+                return ""
 
             # 일반적인 기사 본문 태그 시도
-            article_body = None
-            for selector in ['article', '.article_body', '#articleBodyContents', '.news_end']:
-                article_body = soup.select_one(selector)
-                if article_body:
-                    break
-
-            if article_body:
-                # 스크립트, 스타일 제거
-                for tag in article_body(['script', 'style', 'iframe']):
-                    tag.decompose()
-                return article_body.get_text(strip=True, separator='\n')
+            for xpath in _ARTICLE_XPATHS:
+                found = xpath(root)
+                if found:
+                    article_body = found[0]
+                    # 스크립트, 스타일 제거 (뒤따르는 텍스트는 유지)
+                    etree.strip_elements(article_body, 'script', 'style', 'iframe', with_tail=False)
+                    return '\n'.join(text.strip() for text in article_body.itertext() if text.strip())
 
             return ""
         except Exception as e:
@@ -100,36 +152,57 @@ class NewsCollector:
             return ""
 
     def collect_all_news(self) -> List[Dict]:
-        """모든 키워드에 대해 뉴스 수집"""
-        all_articles = []
+        """모든 키워드에 대해 뉴스 수집 (키워드별 요청을 동시에 실행)"""
+        if not self.keywords:
+            return []
 
         for keyword in self.keywords:
             print(f"🔍 '{keyword}' 키워드 뉴스 수집 중...")
 
+        with ThreadPoolExecutor(max_workers=min(16, len(self.keywords))) as executor:
             # Google News RSS 사용 (API 키 불필요)
-            articles = self.fetch_google_news_rss(keyword)
-            all_articles.extend(articles)
+            results = executor.map(self.fetch_google_news_rss, self.keywords)
 
             # 네이버 API 사용 시 (주석 해제)
-            # articles = self.fetch_naver_news(keyword, max_results=5)
-            # all_articles.extend(articles)
+            # naver_results = executor.map(lambda k: self.fetch_naver_news(k, max_results=5), self.keywords)
+            # results = chain(results, naver_results)
+
+            all_articles = list(chain.from_iterable(results))
 
         print(f"✅ 총 {len(all_articles)}개 기사 수집 완료")
         return all_articles
 
-    def filter_trending_news(self, articles: List[Dict], min_relevance: float = 0.5) -> List[Dict]:
-        """트렌드 및 관련성 기반 필터링"""
+    def scrape_articles_content(self, articles: List[Dict], max_workers: int = 8) -> List[Dict]:
+        """여러 기사의 본문을 동시에 스크래핑하여 각 기사의 'content'에 저장"""
+        if not articles:
+            return articles
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(articles))) as executor:
+            contents = executor.map(self.scrape_article_content,
+                                    [article['link'] for article in articles])
+            for article, content in zip(articles, contents):
+                article['content'] = content
+
+        return articles
+
+    def filter_trending_news(self, articles: List[Dict], min_relevance: float = 0.5,
+                             limit: int = None) -> List[Dict]:
+        """트렌드 및 관련성 기반 필터링
+
+        limit: 상위 N개만 반환 (전체 정렬 대신 heapq로 상위 N개만 선택)
+        """
         # 간단한 점수 시스템: 제목에 키워드가 많을수록 높은 점수
         scored_articles = []
 
         for article in articles:
             score = 0
-            title_lower = article['title'].lower()
 
-            # 키워드 매칭 점수
-            for keyword in self.keywords:
-                if keyword.lower() in title_lower:
-                    score += 1
+            # 키워드 매칭 점수 (제목에 포함된 서로 다른 키워드 수, 한 번의 스캔으로 계산)
+            if self._kw_re is not None:
+                matched = set()
+                for keyword in set(self._kw_re.findall(article['title'].lower())):
+                    matched |= self._kw_contained[keyword]
+                score += len(matched)
 
             # 최신성 점수 (추가 가능)
             score += 0.5
@@ -138,25 +211,22 @@ class NewsCollector:
             if score >= min_relevance:
                 scored_articles.append(article)
 
-        # 점수 기준 정렬
+        # 점수 기준 정렬 (동점이면 수집 순서 유지)
+        if limit is not None:
+            return heapq.nlargest(limit, scored_articles, key=lambda x: x['relevance_score'])
         scored_articles.sort(key=lambda x: x['relevance_score'], reverse=True)
         return scored_articles
 
     def save_to_json(self, articles: List[Dict], filename: str = "collected_news.json"):
         """수집된 뉴스를 JSON 파일로 저장"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump({
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps({
                 'collected_at': datetime.now().isoformat(),
                 'total_count': len(articles),
                 'articles': articles
-            }, f, ensure_ascii=False, indent=2)
+            }, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         print(f"💾 {filename}에 저장 완료")
 
-    @staticmethod
-    def _clean_html(text: str) -> str:
-        """HTML 태그 제거"""
-        return BeautifulSoup(text, 'html.parser').get_text()
-
 
 # 사용 예시
 if __name__ == "__main__":
@@ -175,9 +245,8 @@ if __name__ == "__main__":
         print(f"   키워드: {article['keyword']} | 점수: {article['relevance_score']}")
         print(f"   링크: {article['link']}")
 
-        # 본문 수집 (선택적)
-        # content = collector.scrape_article_content(article['link'])
-        # article['content'] = content[:500]  # 처음 500자만
+    # 본문 수집 (선택적, 동시 실행)
+    # collector.scrape_articles_content(trending_articles[:5])
 
     # 4. JSON 저장
     collector.save_to_json(trending_articles[:20])
@@ -4,30 +4,36 @@ API 연결 테스트 스크립트
 - 대본 생성 테스트
 """
 
-import requests
-import json
+import asyncio
+import os
+import string
+import httpx
+import orjson
 
-def test_gemini_api(api_key: str):
-    """Google Gemini API 테스트"""
-    print("\n" + "="*60)
-    print("🧪 Gemini API 테스트 시작")
-    print("="*60)
+from llm_cache import LLMCache
 
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={api_key}"
+# 연결만 10초 제한, 생성 중 응답 대기는 제한 없음
+_HTTPX_TIMEOUT = httpx.Timeout(None, connect=10.0)
+
+# API_TEST_CACHE=1 로 실행하면 같은 프롬프트의 응답을 캐시에서 재사용 (연결 확인이 아닌 결과 확인용)
+_cache = LLMCache() if os.environ.get("API_TEST_CACHE") else None
 
-    test_article = {
-        'title': '삼성전자, 반도체 분야 50조 투자 발표',
-        'description': '삼성전자가 차세대 반도체 생산을 위해 50조 원 규모의 대규모 투자를 결정했습니다.'
-    }
 
-    prompt = f"""
+# 테스트용 기사
+_TEST_ARTICLE = {
+    'title': '삼성전자, 반도체 분야 50조 투자 발표',
+    'description': '삼성전자가 차세대 반도체 생산을 위해 50조 원 규모의 대규모 투자를 결정했습니다.'
+}
+
+# 프롬프트 템플릿 (모듈 로드 시 한 번만 생성, 기사 내용만 치환)
+_SCRIPT_PROMPT = string.Template("""
 당신은 시니어층(40~60대)을 대상으로 하는 유튜브 뉴스 채널의 전문 작가입니다.
 
 아래 뉴스 기사를 바탕으로 8~10분 분량의 유튜브 영상 대본을 작성해주세요.
 
 [뉴스 기사]
-제목: {test_article['title']}
-내용: {test_article['description']}
+제목: $title
+내용: $description
 
 [대본 작성 요구사항]
 1. **도입부 (30초)**: 강력한 후킹 멘트로 시작 (예: "여러분, 이거 아십니까?", "충격적인 소식입니다")
@@ -46,167 +52,253 @@ def test_gemini_api(api_key: str):
 - 감정적 어필보다는 사실 중심
 
 대본만 출력해주세요.
-    """
+    """)
+
+_THUMBNAIL_PROMPT = string.Template("""
+아래 뉴스 제목을 바탕으로 유튜브 썸네일에 들어갈 강력한 후킹 문구를 10개 생성해주세요.
+
+뉴스 제목: $title
+
+[요구사항]
+1. 15자 이내로 간결하게
+2. 충격, 궁금증 유발
+3. 다양한 스타일 사용:
+   - 질문형: "이게 가능해?"
+   - 숫자형: "50조 투자"
+   - 충격형: "경악! ~~"
+   - 반전형: "알고보니..."
+
+각 제목만 번호와 함께 출력해주세요. 다른 설명은 하지 마세요.
+    """)
+
+# OpenAI 테스트의 시스템 메시지 (매 요청 동일하게 유지)
+_OPENAI_SYSTEM_PROMPT = "당신은 시니어층(40~60대)을 대상으로 하는 유튜브 뉴스 채널의 전문 작가입니다. 정중하고 간결하게 답변하세요."
+
+# Gemini 요청 본문 {"contents":[{"parts":[{"text": ...}]}]} 의 고정 부분
+_GEMINI_BODY_PREFIX = b'{"contents":[{"parts":[{"text":'
+_GEMINI_BODY_SUFFIX = b'}]}]}'
+
+
+def _gemini_body(prompt: str) -> bytes:
+    """Gemini 요청 본문 (고정 부분 사이에 JSON 문자열로 인코딩한 프롬프트만 끼워 넣음)"""
+    return _GEMINI_BODY_PREFIX + orjson.dumps(prompt) + _GEMINI_BODY_SUFFIX
+
+
+def _cache_key(kind: str, prompt: str) -> str:
+    """테스트 응답 캐시 키 (서비스, 모델, 테스트 종류, 프롬프트)"""
+    return LLMCache.make_key("gemini", "gemini-2.5-flash", kind, prompt)
+
+
+async def _aiter_sse_events(response: httpx.Response):
+    """Server-Sent Events 응답의 data 이벤트를 JSON으로 변환하여 반환 (httpx 스트리밍 응답용)"""
+    async for line in response.aiter_lines():
+        if not line.startswith('data:'):
+            continue
+        payload = line[5:].strip()
+        if payload == '[DONE]':
+            return
+        yield orjson.loads(payload)
+
+
+async def _post_json(client: httpx.AsyncClient, url: str, body: bytes) -> httpx.Response:
+    """JSON 본문(인코딩된 bytes) POST (응답 전체를 받은 뒤 반환)"""
+    return await client.post(url, headers={"Content-Type": "application/json"}, content=body)
+
+
+async def test_gemini_api(client: httpx.AsyncClient, api_key: str):
+    """Google Gemini API 테스트"""
+    print("\n" + "="*60)
+    print("🧪 Gemini API 테스트 시작")
+    print("="*60)
+
+    # 스트리밍 엔드포인트: 생성되는 대로 받아서 출력 (첫 글자까지 대기 시간 단축)
+    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:streamGenerateContent?alt=sse&key={api_key}"
+
+    prompt = _SCRIPT_PROMPT.substitute(_TEST_ARTICLE)
+
+    cache_key = _cache_key("script", prompt)
+    cached = _cache.get(cache_key) if _cache else None
+    if cached is not None:
+        print(f"💾 캐시된 대본 사용 ({len(cached)}자)")
+        return True, cached
 
     headers = {"Content-Type": "application/json"}
-    data = {
-        "contents": [{
-            "parts": [{"text": prompt}]
-        }]
-    }
 
     try:
         print(f"📤 요청 전송 중...")
         print(f"URL: {url[:80]}...")
 
-        response = requests.post(url, headers=headers, json=data, timeout=60)
-
-        print(f"📥 응답 상태 코드: {response.status_code}")
-
-        if response.status_code == 200:
-            result = response.json()
-
-            # 응답 구조 출력
-            print(f"\n✅ API 연결 성공!")
-            print(f"\n📋 응답 구조:")
-            print(json.dumps(result, indent=2, ensure_ascii=False)[:500] + "...")
+        async with client.stream("POST", url, headers=headers, content=_gemini_body(prompt)) as response:
+            print(f"📥 응답 상태 코드: {response.status_code}")
 
-            # 대본 추출
-            try:
-                script = result['candidates'][0]['content']['parts'][0]['text']
-                print(f"\n📝 생성된 대본 (처음 500자):")
-                print("-" * 60)
-                print(script[:500])
+            if response.status_code == 200:
+                print(f"\n✅ API 연결 성공!")
+                print(f"\n📝 생성 중인 대본:")
                 print("-" * 60)
+
+                script_parts = []
+                i = 0
+                try:
+                    async for event in _aiter_sse_events(response):
+                        if i == 0:
+                            # 응답 구조 출력 (첫 이벤트)
+                            print(f"📋 응답 구조: {orjson.dumps(event).decode()[:300]}...\n")
+                        i += 1
+                        # 마지막 이벤트는 텍스트 없이 종료 정보만 올 수 있음
+                        for part in event['candidates'][0].get('content', {}).get('parts', []):
+                            token = part.get('text', '')
+                            script_parts.append(token)
+                            print(token, end="", flush=True)
+
+                except KeyError as e:
+                    print(f"\n❌ 응답 파싱 오류: {e}")
+                    print(f"전체 응답: {orjson.dumps(event, option=orjson.OPT_INDENT_2).decode()}")
+                    return False, None
+
+                script = "".join(script_parts)
+                print("\n" + "-" * 60)
                 print(f"\n총 대본 길이: {len(script)}자 (약 {len(script)//150}분 분량)")
 
+                if _cache:
+                    _cache.set(cache_key, script)
+
                 return True, script
+            else:
+                await response.aread()
+                print(f"\n❌ API 호출 실패!")
+                print(f"상태 코드: {response.status_code}")
+                print(f"응답 내용: {response.text}")
+
+                # 일반적인 오류 원인 안내
+                if response.status_code == 400:
+                    print("\n💡 400 오류 원인:")
+                    print("  - API 키 형식이 잘못되었을 수 있습니다")
+                    print("  - 요청 본문 형식이 잘못되었을 수 있습니다")
+                elif response.status_code == 403:
+                    print("\n💡 403 오류 원인:")
+                    print("  - API 키가 유효하지 않습니다")
+                    print("  - Gemini API가 활성화되지 않았습니다")
+                    print("  - https://makersuite.google.com/app/apikey 에서 키 확인")
+                elif response.status_code == 429:
+                    print("\n💡 429 오류 원인:")
+                    print("  - API 사용량 한도 초과")
+                    print("  - 잠시 후 다시 시도하세요")
 
-            except KeyError as e:
-                print(f"❌ 응답 파싱 오류: {e}")
-                print(f"전체 응답: {json.dumps(result, indent=2, ensure_ascii=False)}")
                 return False, None
-        else:
-            print(f"\n❌ API 호출 실패!")
-            print(f"상태 코드: {response.status_code}")
-            print(f"응답 내용: {response.text}")
-
-            # 일반적인 오류 원인 안내
-            if response.status_code == 400:
-                print("\n💡 400 오류 원인:")
-                print("  - API 키 형식이 잘못되었을 수 있습니다")
-                print("  - 요청 본문 형식이 잘못되었을 수 있습니다")
-            elif response.status_code == 403:
-                print("\n💡 403 오류 원인:")
-                print("  - API 키가 유효하지 않습니다")
-                print("  - Gemini API가 활성화되지 않았습니다")
-                print("  - https://makersuite.google.com/app/apikey 에서 키 확인")
-            elif response.status_code == 429:
-                print("\n💡 429 오류 원인:")
-                print("  - API 사용량 한도 초과")
-                print("  - 잠시 후 다시 시도하세요")
-
-            return False, None
-
-    except requests.exceptions.Timeout:
-        print("❌ 요청 시간 초과 (60초)")
+
+    except httpx.ConnectTimeout:
+        print("❌ 연결 시간 초과 (10초)")
         return False, None
     except Exception as e:
         print(f"❌ 예외 발생: {e}")
         return False, None
 
 
-def test_openai_api(api_key: str):
-    """OpenAI API 테스트"""
+async def test_openai_api(api_key: str):
+    """OpenAI API 테스트 (공식 비동기 클라이언트로 스트리밍)"""
     print("\n" + "="*60)
     print("🧪 OpenAI API 테스트 시작")
     print("="*60)
 
-    url = "https://api.openai.com/v1/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
-    data = {
-        "model": "gpt-4o-mini",
-        "messages": [{"role": "user", "content": "안녕하세요. 간단한 인사말로 응답해주세요."}],
-        "max_tokens": 100
-    }
-
     try:
-        response = requests.post(url, headers=headers, json=data, timeout=30)
+        from openai import AsyncOpenAI, APIStatusError
+    except ImportError:
+        print("❌ openai 패키지가 설치되지 않았습니다. pip install openai 실행 필요")
+        return False
 
-        print(f"📥 응답 상태 코드: {response.status_code}")
+    try:
+        async with AsyncOpenAI(api_key=api_key, timeout=_HTTPX_TIMEOUT) as client:
+            stream = await client.chat.completions.create(
+                model="gpt-4o-mini",
+                # 고정된 지시문을 항상 첫 메시지로 둠 (서버 측 프롬프트 캐시는 1024토큰 이상의 동일 접두사에만
+                # 적용되므로 이 짧은 테스트에서는 적중하지 않음, 긴 지시문을 쓸 때를 위한 메시지 구성)
+                messages=[
+                    {"role": "system", "content": _OPENAI_SYSTEM_PROMPT},
+                    {"role": "user", "content": "안녕하세요. 간단한 인사말로 응답해주세요."}
+                ],
+                max_tokens=100,
+                response_format={"type": "text"},
+                stream=True
+            )
 
-        if response.status_code == 200:
-            result = response.json()
-            message = result['choices'][0]['message']['content']
             print(f"✅ OpenAI API 연결 성공!")
-            print(f"응답: {message}")
+            print("응답: ", end="", flush=True)
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    print(chunk.choices[0].delta.content, end="", flush=True)
+            print()
             return True
-        else:
-            print(f"❌ OpenAI API 호출 실패: {response.status_code}")
-            print(f"응답: {response.text}")
-            return False
 
+    except APIStatusError as e:
+        print(f"❌ OpenAI API 호출 실패: {e.status_code}")
+        print(f"응답: {e.response.text}")
+        return False
     except Exception as e:
         print(f"❌ 예외 발생: {e}")
         return False
 
 
-def test_thumbnail_generation(api_key: str, article_title: str):
-    """썸네일 제목 생성 테스트"""
-    print("\n" + "="*60)
-    print("🧪 썸네일 제목 생성 테스트")
-    print("="*60)
+async def test_thumbnail_generation(client: httpx.AsyncClient, api_key: str, article_title: str):
+    """썸네일 제목 생성 테스트
 
+    대본 스트리밍 출력과 섞이지 않도록 직접 출력하지 않고 (성공 여부, 결과 텍스트)를 반환한다.
+    결과 텍스트는 성공 시 생성된 제목들, 실패 시 오류 메시지
+    """
     url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={api_key}"
 
-    prompt = f"""
-아래 뉴스 제목을 바탕으로 유튜브 썸네일에 들어갈 강력한 후킹 문구를 10개 생성해주세요.
-
-뉴스 제목: {article_title}
-
-[요구사항]
-1. 15자 이내로 간결하게
-2. 충격, 궁금증 유발
-3. 다양한 스타일 사용:
-   - 질문형: "이게 가능해?"
-   - 숫자형: "50조 투자"
-   - 충격형: "경악! ~~"
-   - 반전형: "알고보니..."
-
-각 제목만 번호와 함께 출력해주세요. 다른 설명은 하지 마세요.
-    """
+    prompt = _THUMBNAIL_PROMPT.substitute(title=article_title)
 
-    headers = {"Content-Type": "application/json"}
-    data = {
-        "contents": [{
-            "parts": [{"text": prompt}]
-        }]
-    }
+    cache_key = _cache_key("thumbnail", prompt)
+    cached = _cache.get(cache_key) if _cache else None
+    if cached is not None:
+        return True, cached
 
     try:
-        response = requests.post(url, headers=headers, json=data, timeout=30)
+        response = await _post_json(client, url, _gemini_body(prompt))
 
         if response.status_code == 200:
-            result = response.json()
+            result = orjson.loads(response.content)
             text = result['candidates'][0]['content']['parts'][0]['text']
 
-            print(f"✅ 썸네일 제목 생성 성공!")
-            print(f"\n생성된 제목들:")
-            print("-" * 60)
-            print(text)
-            print("-" * 60)
+            if _cache:
+                _cache.set(cache_key, text)
 
             return True, text
         else:
-            print(f"❌ 실패: {response.status_code}")
-            return False, None
+            return False, f"실패: {response.status_code}"
 
     except Exception as e:
-        print(f"❌ 예외 발생: {e}")
-        return False, None
+        return False, f"예외 발생: {e}"
+
+
+def _print_thumbnail_result(success: bool, text: str):
+    """썸네일 제목 생성 테스트 결과 출력"""
+    print("\n" + "="*60)
+    print("🧪 썸네일 제목 생성 테스트")
+    print("="*60)
+
+    if success:
+        print(f"✅ 썸네일 제목 생성 성공!")
+        print(f"\n생성된 제목들:")
+        print("-" * 60)
+        print(text)
+        print("-" * 60)
+    else:
+        print(f"❌ {text}")
+
+
+async def run_gemini_tests(api_key: str):
+    """Gemini 대본/썸네일 테스트를 하나의 연결 풀(HTTP/2)로 동시에 실행
+
+    대본은 생성되는 대로 출력하고, 썸네일 제목은 대본 출력이 끝난 뒤에 출력한다.
+    """
+    async with httpx.AsyncClient(http2=True, timeout=_HTTPX_TIMEOUT) as client:
+        (success, script), thumbnail_result = await asyncio.gather(
+            test_gemini_api(client, api_key),
+            test_thumbnail_generation(client, api_key, _TEST_ARTICLE['title'])
+        )
+    _print_thumbnail_result(*thumbnail_result)
+    return success, script
 
 
 if __name__ == "__main__":
@@ -225,13 +317,10 @@ if __name__ == "__main__":
     if choice in ['1', '3']:
         api_key = input("\nGemini API 키를 입력하세요: ").strip()
         if api_key:
-            # 대본 생성 테스트
-            success, script = test_gemini_api(api_key)
+            # 대본 생성 + 썸네일 제목 생성 테스트 (동시 실행)
+            success, script = asyncio.run(run_gemini_tests(api_key))
 
             if success:
-                # 썸네일 제목 생성 테스트
-                test_thumbnail_generation(api_key, "삼성전자, 반도체 분야 50조 투자 발표")
-
                 print("\n" + "="*60)
                 print("✅ Gemini API 모든 테스트 통과!")
                 print("="*60)
@@ -254,7 +343,7 @@ if __name__ == "__main__":
     if choice in ['2', '3']:
         api_key = input("\nOpenAI API 키를 입력하세요 (sk-...): ").strip()
         if api_key:
-            test_openai_api(api_key)
+            asyncio.run(test_openai_api(api_key))
         else:
             print("❌ API 키가 입력되지 않았습니다.")
 
@@ -4,36 +4,126 @@ TTS (Text-to-Speech) 음성 생성
 - 자연스러운 AI 보이스 생성
 """
 
+import asyncio
+import os
+import re
+import orjson
 import requests
-import json
 from pathlib import Path
 from typing import Dict
+from xml.sax.saxutils import escape as xml_escape
+
+from http_pool import session_for_url
+
+# 문장 단위 분할: 마침표/물음표/느낌표 뒤에 공백(줄바꿈 포함)이 오거나 텍스트가 끝나는 곳까지
+# ("3.5조"처럼 숫자 사이의 마침표에서는 나누지 않음)
+_SENTENCE_RE = re.compile(r'\S.*?(?:[.!?。]+(?=\s)|$)', re.S)
+
+# 음성 스트림을 파일에 쓸 때 한 번의 writev로 모아 쓰는 조각 수
+_WRITEV_BATCH = 16
+
+
+def _writev_all(fd: int, buffers: list):
+    """buffers를 모두 기록할 때까지 os.writev 반복 (일부만 기록된 경우 남은 부분부터 다시)"""
+    while buffers:
+        written = os.writev(fd, buffers)
+        while buffers and written >= len(buffers[0]):
+            written -= len(buffers[0])
+            buffers.pop(0)
+        if written:
+            buffers[0] = buffers[0][written:]
 
 class TTSGenerator:
-    def __init__(self, service: str = "elevenlabs", api_key: str = None):
+    def __init__(self, service: str = "elevenlabs", api_key: str = None,
+                 output_dir: str = "output/audio", session: requests.Session = None):
         """
         service: "elevenlabs", "google", "azure"
+        output_dir: 음성 파일 저장 폴더
+        session: TTS API 요청에 쓸 requests.Session (생략 시 공용 세션)
         """
         self.service = service
         self.api_key = api_key
-        self.output_dir = Path("output/audio")
+        self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.session = session
 
     def generate_audio(self, text: str, voice_style: str = "professional",
                       output_filename: str = "voice_output.mp3") -> Dict:
         """텍스트를 음성으로 변환"""
 
+        # 길이는 한 번만 구해 각 서비스 및 Mock 대체 경로에 전달
+        text_length = len(text)
+
         if self.service == "elevenlabs":
-            return self._generate_elevenlabs(text, voice_style, output_filename)
+            return self._generate_elevenlabs(text, voice_style, output_filename, text_length)
         elif self.service == "google":
-            return self._generate_google_tts(text, voice_style, output_filename)
+            return self._generate_google_tts(text, voice_style, output_filename, text_length)
         elif self.service == "azure":
-            return self._generate_azure_tts(text, voice_style, output_filename)
+            return self._generate_azure_tts(text, voice_style, output_filename, text_length)
+        else:
+            return self._generate_mock(text, output_filename, text_length)
+
+    async def generate_audio_many(self, chunks: list, voice_style: str = "professional",
+                                  base_name: str = "voice_output", max_concurrent: int = 6) -> Dict:
+        """분할된 텍스트(split_text_for_tts 결과)를 동시에 음성으로 변환한 뒤 하나로 병합
+
+        각 조각은 base_name_000.mp3, base_name_001.mp3 ... 로 저장되고 base_name.mp3로 병합된다.
+        max_concurrent: 동시 요청 수 (TTS 서비스의 동시 요청 제한에 맞게 조정)
+
+        API 실패로 Mock으로 대체된 조각이 있으면 병합하지 않고 output_file은 None으로 반환한다.
+        (service가 "mock"이면 generate_audio와 같이 base_name.mp3로 Mock 병합 파일을 만들어 반환)
+        """
+        result = {
+            'output_file': None,
+            'chunk_files': [],
+            'service': self.service,
+            'voice_style': voice_style,
+            'duration_estimate': sum(len(chunk) for chunk in chunks) // 150
+        }
+        if not chunks:
+            result['status'] = 'failed (empty)'
+            return result
+
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def synthesize(i: int, chunk: str):
+            async with semaphore:
+                return i, await asyncio.to_thread(
+                    self.generate_audio, chunk, voice_style, f"{base_name}_{i:03}.mp3"
+                )
+
+        # 끝나는 순서대로 받아서 느린 조각이 진행 상황 출력을 막지 않도록 함
+        results = [None] * len(chunks)
+        tasks = [synthesize(i, chunk) for i, chunk in enumerate(chunks)]
+        for done, future in enumerate(asyncio.as_completed(tasks), 1):
+            i, chunk_result = await future
+            results[i] = chunk_result
+            print(f"  음성 조각 {done}/{len(chunks)} 완료")
+
+        result['chunk_files'] = [chunk_result['output_file'] for chunk_result in results]
+
+        # Mock 파일은 음성이 아니므로 병합하지 않음
+        mock_count = sum(1 for chunk_result in results if chunk_result['service'] == 'mock')
+        if mock_count:
+            if self.service == 'mock':
+                mock_result = self._generate_mock(' '.join(chunks), f"{base_name}.mp3")
+                result['output_file'] = mock_result['output_file']
+                result['status'] = mock_result['status']
+            else:
+                print(f"  ⚠️ {mock_count}개 조각이 Mock으로 대체되어 병합하지 않습니다")
+                result['status'] = 'failed (mock fallback)'
+            return result
+
+        if len(results) == 1:
+            result['output_file'] = result['chunk_files'][0]
         else:
-            return self._generate_mock(text, output_filename)
+            result['output_file'] = self.merge_audio_files(result['chunk_files'], f"{base_name}.mp3")
+
+        result['status'] = 'success' if result['output_file'] else 'failed (merge)'
+        return result
 
     def _generate_elevenlabs(self, text: str, voice_style: str,
-                            output_filename: str) -> Dict:
+                            output_filename: str, text_length: int) -> Dict:
         """ElevenLabs TTS API 호출"""
 
         # 음성 스타일에 따른 voice_id 매핑
@@ -45,9 +135,11 @@ class TTSGenerator:
 
         voice_id = voice_mapping.get(voice_style, voice_mapping["professional"])
 
-        url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
+        # /stream: 합성이 끝나기 전부터 음성 데이터를 전송받음
+        url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}/stream"
         headers = {
             "Accept": "audio/mpeg",
+            "Accept-Encoding": "identity",  # MP3는 이미 압축되어 있으므로 전송 압축 불필요
             "Content-Type": "application/json",
             "xi-api-key": self.api_key
         }
@@ -63,33 +155,33 @@ class TTSGenerator:
         }
 
         try:
-            response = requests.post(url, headers=headers, json=data, timeout=120)
-
-            if response.status_code == 200:
-                output_path = self.output_dir / output_filename
-                with open(output_path, 'wb') as f:
-                    f.write(response.content)
-
-                return {
-                    'status': 'success',
-                    'output_file': str(output_path),
-                    'service': 'elevenlabs',
-                    'voice_style': voice_style,
-                    'duration_estimate': len(text) // 150  # 분 단위 추정
-                }
-            else:
-                print(f"ElevenLabs API 오류: {response.status_code} - {response.text}")
-                return self._generate_mock(text, output_filename)
+            with session_for_url(url, self.session).post(url, headers=headers, data=orjson.dumps(data), timeout=120,
+                                                          stream=True) as response:
+                if response.status_code == 200:
+                    output_path = self.output_dir / output_filename
+                    self._save_stream(response, output_path)
+
+                    return {
+                        'status': 'success',
+                        'output_file': str(output_path),
+                        'service': 'elevenlabs',
+                        'voice_style': voice_style,
+                        'duration_estimate': text_length // 150  # 분 단위 추정
+                    }
+                else:
+                    print(f"ElevenLabs API 오류: {response.status_code} - {response.text}")
+                    return self._generate_mock(text, output_filename, text_length)
 
         except Exception as e:
             print(f"ElevenLabs API 호출 실패: {e}")
-            return self._generate_mock(text, output_filename)
+            return self._generate_mock(text, output_filename, text_length)
 
     def _generate_google_tts(self, text: str, voice_style: str,
-                            output_filename: str) -> Dict:
+                            output_filename: str, text_length: int) -> Dict:
         """Google Cloud TTS API 호출"""
 
         from google.cloud import texttospeech
+        from google.api_core import exceptions, retry
 
         try:
             client = texttospeech.TextToSpeechClient()
@@ -115,10 +207,20 @@ class TTSGenerator:
                 pitch=0.0  # 음높이 (-20.0 ~ 20.0)
             )
 
+            # 할당량 초과/일시적 서버 오류는 지수 백오프로 재시도 (최대 120초)
             response = client.synthesize_speech(
                 input=synthesis_input,
                 voice=voice,
-                audio_config=audio_config
+                audio_config=audio_config,
+                retry=retry.Retry(
+                    predicate=retry.if_exception_type(
+                        exceptions.ResourceExhausted,
+                        exceptions.ServiceUnavailable,
+                        exceptions.InternalServerError
+                    ),
+                    initial=1.0, maximum=30.0, multiplier=2.0, deadline=120.0
+                ),
+                timeout=120
             )
 
             output_path = self.output_dir / output_filename
@@ -130,15 +232,15 @@ class TTSGenerator:
                 'output_file': str(output_path),
                 'service': 'google',
                 'voice_style': voice_style,
-                'duration_estimate': len(text) // 150
+                'duration_estimate': text_length // 150
             }
 
         except Exception as e:
             print(f"Google TTS API 호출 실패: {e}")
-            return self._generate_mock(text, output_filename)
+            return self._generate_mock(text, output_filename, text_length)
 
     def _generate_azure_tts(self, text: str, voice_style: str,
-                           output_filename: str) -> Dict:
+                           output_filename: str, text_length: int) -> Dict:
         """Azure Cognitive Services TTS API 호출"""
 
         # 음성 스타일에 따른 설정
@@ -153,48 +255,77 @@ class TTSGenerator:
         url = "https://koreacentral.tts.speech.microsoft.com/cognitiveservices/v1"
         headers = {
             "Ocp-Apim-Subscription-Key": self.api_key,
+            "Accept-Encoding": "identity",  # MP3는 이미 압축되어 있으므로 전송 압축 불필요
             "Content-Type": "application/ssml+xml",
             "X-Microsoft-OutputFormat": "audio-16khz-128kbitrate-mono-mp3"
         }
 
-        ssml = f"""
-        <speak version='1.0' xml:lang='ko-KR'>
-            <voice xml:lang='ko-KR' name='{voice_name}'>
-                {text}
-            </voice>
-        </speak>
-        """
+        # 본문을 f-string에 넣었다가 다시 인코딩하지 않고 bytes로 한 번에 조립
+        # (&, < 등은 SSML이 깨지지 않도록 이스케이프)
+        ssml = b"".join((
+            f"<speak version='1.0' xml:lang='ko-KR'><voice xml:lang='ko-KR' name='{voice_name}'>".encode('utf-8'),
+            xml_escape(text).encode('utf-8'),
+            b"</voice></speak>"
+        ))
 
         try:
-            response = requests.post(url, headers=headers, data=ssml.encode('utf-8'), timeout=120)
-
-            if response.status_code == 200:
-                output_path = self.output_dir / output_filename
-                with open(output_path, 'wb') as f:
-                    f.write(response.content)
-
-                return {
-                    'status': 'success',
-                    'output_file': str(output_path),
-                    'service': 'azure',
-                    'voice_style': voice_style,
-                    'duration_estimate': len(text) // 150
-                }
-            else:
-                print(f"Azure TTS API 오류: {response.status_code}")
-                return self._generate_mock(text, output_filename)
+            with session_for_url(url, self.session).post(url, headers=headers, data=ssml,
+                                                          timeout=120, stream=True) as response:
+                if response.status_code == 200:
+                    output_path = self.output_dir / output_filename
+                    self._save_stream(response, output_path)
+
+                    return {
+                        'status': 'success',
+                        'output_file': str(output_path),
+                        'service': 'azure',
+                        'voice_style': voice_style,
+                        'duration_estimate': text_length // 150
+                    }
+                else:
+                    print(f"Azure TTS API 오류: {response.status_code}")
+                    return self._generate_mock(text, output_filename, text_length)
 
         except Exception as e:
             print(f"Azure TTS API 호출 실패: {e}")
-            return self._generate_mock(text, output_filename)
+            return self._generate_mock(text, output_filename, text_length)
+
+    @staticmethod
+    def _save_stream(response: requests.Response, output_path: Path, chunk_size: int = 64 * 1024):
+        """음성 응답을 메모리에 모으지 않고 받는 대로 파일에 기록
+
+        os.writev를 지원하면 여러 조각을 모아 한 번의 시스템 콜로 기록 (Windows 등은 일반 write)
+        """
+        if not hasattr(os, 'writev'):
+            with open(output_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    f.write(chunk)
+            return
 
-    def _generate_mock(self, text: str, output_filename: str) -> Dict:
+        fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            batch = []
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if chunk:
+                    batch.append(chunk)
+                if len(batch) >= _WRITEV_BATCH:
+                    _writev_all(fd, batch)
+                    batch = []
+            if batch:
+                _writev_all(fd, batch)
+        finally:
+            os.close(fd)
+
+    def _generate_mock(self, text: str, output_filename: str, text_length: int = None) -> Dict:
         """Mock 음성 생성 (테스트용)"""
         output_path = self.output_dir / output_filename
+        if text_length is None:
+            text_length = len(text)
+        duration = text_length // 150
 
-        # 더미 파일 생성
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(f"[Mock Audio File]\nText: {text[:100]}...\nDuration: {len(text) // 150} minutes")
+        # 더미 파일 생성 (한 번 인코딩한 bytes를 그대로 기록)
+        with open(output_path, 'wb') as f:
+            f.write(f"[Mock Audio File]\nText: {text[:100]}...\nDuration: {duration} minutes".encode('utf-8'))
 
         print(f"Mock 음성 파일 생성: {output_path}")
 
@@ -202,51 +333,88 @@ class TTSGenerator:
             'status': 'success (mock)',
             'output_file': str(output_path),
             'service': 'mock',
-            'duration_estimate': len(text) // 150,
-            'text_length': len(text)
+            'duration_estimate': duration,
+            'text_length': text_length
         }
 
     def split_text_for_tts(self, text: str, max_length: int = 5000) -> list:
-        """긴 텍스트를 TTS 제한 길이에 맞게 분할"""
-        sentences = text.replace('\n', ' ').split('. ')
+        """긴 텍스트를 TTS 제한 길이에 맞게 분할 (문장 단위, 한 문장이 너무 길면 강제로 자름)"""
         chunks = []
-        current_chunk = ""
-
-        for sentence in sentences:
-            if len(current_chunk) + len(sentence) < max_length:
-                current_chunk += sentence + ". "
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                current_chunk = sentence + ". "
-
-        if current_chunk:
-            chunks.append(current_chunk.strip())
+        parts = []
+        current_length = 0
+
+        for match in _SENTENCE_RE.finditer(text):
+            sentence = ' '.join(match.group().split())
+            if len(sentence) > max_length and parts:
+                # 강제로 자른 조각보다 앞 문장들이 먼저 나오도록 먼저 내보냄
+                chunks.append(' '.join(parts))
+                parts = []
+                current_length = 0
+            while len(sentence) > max_length:
+                chunks.append(sentence[:max_length])
+                sentence = sentence[max_length:]
+
+            # 문장 사이 공백 한 칸 포함
+            added = len(sentence) + (1 if parts else 0)
+            if current_length + added > max_length:
+                chunks.append(' '.join(parts))
+                parts = []
+                added = len(sentence)
+                current_length = 0
+            parts.append(sentence)
+            current_length += added
+
+        if parts:
+            chunks.append(' '.join(parts))
 
         return chunks
 
     def merge_audio_files(self, audio_files: list, output_filename: str = "merged_audio.mp3"):
-        """여러 음성 파일을 하나로 병합 (pydub 사용)"""
-        try:
-            from pydub import AudioSegment
-
-            combined = AudioSegment.empty()
-            for audio_file in audio_files:
-                audio = AudioSegment.from_mp3(audio_file)
-                combined += audio
+        """여러 음성 파일을 하나로 병합
 
+        같은 TTS 설정으로 만든 MP3는 프레임을 그대로 이어 붙이면 되므로 디코딩/재인코딩 없이 바이트 단위로 병합
+        (첫 파일 이후의 ID3v2 태그, 마지막 파일 이전의 ID3v1 태그는 제외)
+        """
+        try:
             output_path = self.output_dir / output_filename
-            combined.export(output_path, format="mp3")
+            last = len(audio_files) - 1
+
+            with open(output_path, 'wb') as out:
+                for i, audio_file in enumerate(audio_files):
+                    with open(audio_file, 'rb') as f:
+                        size = f.seek(0, 2)
+                        start = self._id3v2_size(f) if i > 0 else 0
+                        end = size
+                        if i < last and size >= 128:
+                            f.seek(size - 128)
+                            if f.read(3) == b'TAG':
+                                end = size - 128
+
+                        f.seek(start)
+                        remaining = end - start
+                        while remaining > 0:
+                            chunk = f.read(min(remaining, 1024 * 1024))
+                            if not chunk:
+                                break
+                            out.write(chunk)
+                            remaining -= len(chunk)
 
             return str(output_path)
 
-        except ImportError:
-            print("pydub가 설치되지 않았습니다. pip install pydub 실행 필요")
-            return None
         except Exception as e:
             print(f"오디오 병합 실패: {e}")
             return None
 
+    @staticmethod
+    def _id3v2_size(f) -> int:
+        """파일 앞의 ID3v2 태그 길이 (없으면 0)"""
+        f.seek(0)
+        header = f.read(10)
+        if len(header) < 10 or header[:3] != b'ID3':
+            return 0
+        # 태그 크기: 7비트씩 4바이트(syncsafe), 헤더 10바이트와 푸터(플래그 0x10) 10바이트는 별도
+        size = (header[6] << 21) | (header[7] << 14) | (header[8] << 7) | header[9]
+        return 10 + size + (10 if header[5] & 0x10 else 0)
 
 # 사용 예시
 if __name__ == "__main__":
@@ -284,3 +452,7 @@ if __name__ == "__main__":
     # 실제 API 사용 예시 (주석 처리)
     # tts_elevenlabs = TTSGenerator(service="elevenlabs", api_key="YOUR_API_KEY")
     # result = tts_elevenlabs.generate_audio(sample_script, "professional")
+
+    # 긴 대본은 분할 후 동시 생성
+    # chunks = tts_elevenlabs.split_text_for_tts(sample_script)
+    # result = asyncio.run(tts_elevenlabs.generate_audio_many(chunks, "professional", "long_voice"))
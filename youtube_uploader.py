@@ -5,24 +5,42 @@
 - 예약 업로드 지원
 """
 
+import hashlib
+import importlib.util
 import os
+import sys
 from pathlib import Path
 from datetime import datetime, timedelta
-import json
+import orjson
 
-try:
-    from google.oauth2.credentials import Credentials
-    from google_auth_oauthlib.flow import InstalledAppFlow
-    from google.auth.transport.requests import Request
-    from googleapiclient.discovery import build
-    from googleapiclient.http import MediaFileUpload
-    import pickle
-    YOUTUBE_API_AVAILABLE = True
-except ImportError:
-    YOUTUBE_API_AVAILABLE = False
+
+def _module_available(name: str) -> bool:
+    """모듈을 실제로 import하지 않고 설치 여부만 확인"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except ImportError:  # 상위 패키지(google 등)가 없는 경우
+        return False
+
+
+# Google API 라이브러리는 import 비용이 크므로 설치 여부만 확인하고, 실제 import는 인증/업로드 시점에 수행
+YOUTUBE_API_AVAILABLE = all(
+    _module_available(name)
+    for name in ('google.oauth2', 'google_auth_oauthlib', 'googleapiclient')
+)
+if not YOUTUBE_API_AVAILABLE:
     print("Warning: YouTube API 라이브러리가 설치되지 않았습니다.")
     print("설치: pip install google-auth-oauthlib google-auth-httplib2 google-api-python-client")
 
+# 업로드 진행률 표시 (선택, 없으면 10% 단위로 출력)
+try:
+    from tqdm import tqdm
+except ImportError:
+    tqdm = None
+
+# 인증된 YouTube API 클라이언트 (토큰 파일 경로별, 같은 프로세스에서 업로더를 다시 만들 때 재사용)
+# httplib2 기반이라 스레드 간 동시 사용은 안전하지 않음 (업로드는 한 번에 하나씩)
+_youtube_clients = {}
+
 
 class YouTubeUploader:
     def __init__(self, credentials_file: str = "client_secrets.json"):
@@ -30,21 +48,47 @@ class YouTubeUploader:
         credentials_file: Google Cloud Console에서 다운로드한 OAuth 2.0 자격증명 파일
         """
         self.credentials_file = credentials_file
-        self.token_file = "youtube_token.pickle"
+        self.token_file = "youtube_token.json"
+        self.legacy_token_file = "youtube_token.pickle"  # 이전 버전이 pickle로 저장하던 토큰 (JSON으로 옮긴 뒤 삭제)
+        self.index_file = "youtube_upload_index.json"  # "파일 해시:공개 설정:예약 시간" -> 영상 ID
         self.scopes = ["https://www.googleapis.com/auth/youtube.upload"]
         self.youtube = None
+        self.uploads_playlist_id = None  # 채널의 업로드 재생목록 ID (한 번 조회 후 재사용)
 
         if YOUTUBE_API_AVAILABLE:
             self._authenticate()
 
     def _authenticate(self):
         """YouTube API 인증"""
+        client_key = os.path.abspath(self.token_file)
+        if client_key in _youtube_clients:
+            self.youtube = _youtube_clients[client_key]
+            return
+
+        from google.oauth2.credentials import Credentials
+        from google_auth_oauthlib.flow import InstalledAppFlow
+        from google.auth.transport.requests import Request
+        from googleapiclient.discovery import build
+
         creds = None
+        migrate_legacy = not os.path.exists(self.token_file) and os.path.exists(self.legacy_token_file)
 
-        # 저장된 토큰 로드
+        # 저장된 토큰 로드 (손상된 파일이면 다시 인증)
         if os.path.exists(self.token_file):
-            with open(self.token_file, 'rb') as token:
-                creds = pickle.load(token)
+            try:
+                with open(self.token_file, 'rb') as token:
+                    creds = Credentials.from_authorized_user_info(orjson.loads(token.read()), self.scopes)
+            except ValueError as e:
+                print(f"저장된 토큰을 읽을 수 없습니다: {e}")
+        elif migrate_legacy:
+            # JSON 토큰이 없으면 이전 pickle 토큰을 한 번만 읽어서 JSON으로 옮김 (다시 로그인하지 않도록)
+            import pickle
+            try:
+                with open(self.legacy_token_file, 'rb') as token:
+                    creds = pickle.load(token)
+                print(f"이전 토큰 파일을 변환합니다: {self.legacy_token_file} -> {self.token_file}")
+            except Exception as e:
+                print(f"이전 토큰 파일을 읽을 수 없습니다: {e}")
 
         # 토큰이 없거나 만료된 경우
         if not creds or not creds.valid:
@@ -52,6 +96,11 @@ class YouTubeUploader:
                 creds.refresh(Request())
             else:
                 if os.path.exists(self.credentials_file):
+                    # 브라우저 로그인은 사용자가 있어야 하므로 스케줄러 등 비대화형 실행에서는 기다리지 않고 중단
+                    if not (sys.stdin and sys.stdin.isatty()):
+                        print("❌ 유효한 YouTube 토큰이 없어 브라우저 로그인이 필요합니다.")
+                        print("터미널에서 한 번 직접 실행하여 인증한 뒤 다시 실행하세요.")
+                        return
                     flow = InstalledAppFlow.from_client_secrets_file(
                         self.credentials_file, self.scopes
                     )
@@ -60,20 +109,32 @@ class YouTubeUploader:
                     print(f"❌ {self.credentials_file} 파일이 없습니다.")
                     print("Google Cloud Console에서 OAuth 2.0 자격증명을 다운로드하세요.")
                     return
-
-            # 토큰 저장
-            with open(self.token_file, 'wb') as token:
-                pickle.dump(creds, token)
+            save_token = True
+        else:
+            save_token = migrate_legacy
+
+        if save_token:
+            # 토큰 저장 (쓰는 도중 중단되어도 기존 토큰이 깨지지 않도록 임시 파일 후 교체)
+            tmp_file = f"{self.token_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as token:
+                token.write(creds.to_json())
+            os.replace(tmp_file, self.token_file)
+            if migrate_legacy:
+                os.remove(self.legacy_token_file)
 
         # YouTube API 클라이언트 생성
-        self.youtube = build('youtube', 'v3', credentials=creds)
+        # (라이브러리에 포함된 discovery 문서 사용: 네트워크 요청 없음, 파일 캐시 경고도 끔)
+        self.youtube = build('youtube', 'v3', credentials=creds,
+                             static_discovery=True, cache_discovery=False)
+        _youtube_clients[client_key] = self.youtube
         print("✅ YouTube API 인증 완료")
 
     def upload_video(self, video_file: str, title: str, description: str,
                     tags: list = None, category_id: str = "22",
                     privacy_status: str = "public",
                     thumbnail_file: str = None,
-                    publish_at: datetime = None) -> dict:
+                    publish_at: datetime = None,
+                    skip_duplicates: bool = True) -> dict:
         """
         유튜브 영상 업로드
 
@@ -86,6 +147,7 @@ class YouTubeUploader:
             privacy_status: "public", "private", "unlisted"
             thumbnail_file: 썸네일 이미지 파일 경로
             publish_at: 예약 업로드 시간 (datetime 객체)
+            skip_duplicates: 같은 파일을 같은 공개 설정/예약 시간으로 이미 올렸으면 다시 올리지 않음
 
         Returns:
             업로드된 영상 정보
@@ -95,6 +157,24 @@ class YouTubeUploader:
             return self._upload_mock(video_file, title, description)
 
         try:
+            # 이미 업로드한 파일이면 다시 보내지 않고 기존 영상 정보 반환
+            # (같은 파일이라도 공개 설정이나 예약 시간이 다르면 별도 업로드로 취급)
+            upload_key = ':'.join((
+                self._file_sha256(video_file),
+                privacy_status,
+                publish_at.isoformat() if publish_at else ''
+            ))
+            upload_index = self._load_upload_index()
+            if skip_duplicates and upload_key in upload_index:
+                video_id = upload_index[upload_key]
+                print(f"⏭️  이미 업로드된 영상입니다: {video_id}")
+                return {
+                    'status': 'skipped (duplicate)',
+                    'video_id': video_id,
+                    'video_url': f"https://www.youtube.com/watch?v={video_id}",
+                    'title': title
+                }
+
             # 영상 메타데이터 설정
             body = {
                 'snippet': {
@@ -115,9 +195,11 @@ class YouTubeUploader:
                 body['status']['privacyStatus'] = 'private'
 
             # 영상 파일 업로드
+            from googleapiclient.http import MediaFileUpload
             media = MediaFileUpload(
                 video_file,
-                chunksize=1024*1024,  # 1MB chunks
+                mimetype='video/*',  # 확장자로 형식을 추측하지 않음
+                chunksize=8*1024*1024,  # 8MB chunks (256KB의 배수, 요청 수를 줄여 왕복 지연 감소)
                 resumable=True
             )
 
@@ -130,11 +212,29 @@ class YouTubeUploader:
             )
 
             response = None
-            while response is None:
-                status, response = request.next_chunk()
-                if status:
-                    progress = int(status.progress() * 100)
-                    print(f"  업로드 진행: {progress}%")
+            total_size = os.path.getsize(video_file)
+            progress_bar = tqdm(total=total_size, unit='B', unit_scale=True,
+                                desc="  업로드 진행") if tqdm else None
+            last_printed = -1
+            try:
+                while response is None:
+                    # 일시적인 5xx/네트워크 오류는 지수 백오프로 최대 5회 재시도
+                    status, response = request.next_chunk(num_retries=5)
+                    if status is None:
+                        continue
+                    if progress_bar is not None:
+                        progress_bar.update(status.resumable_progress - progress_bar.n)
+                    else:
+                        # 청크마다 출력하지 않고 10% 단위가 바뀔 때만 출력
+                        progress = int(status.progress() * 10) * 10
+                        if progress != last_printed:
+                            print(f"  업로드 진행: {progress}%")
+                            last_printed = progress
+                if progress_bar is not None:
+                    progress_bar.update(total_size - progress_bar.n)
+            finally:
+                if progress_bar is not None:
+                    progress_bar.close()
 
             video_id = response['id']
             video_url = f"https://www.youtube.com/watch?v={video_id}"
@@ -143,6 +243,9 @@ class YouTubeUploader:
             print(f"  영상 ID: {video_id}")
             print(f"  URL: {video_url}")
 
+            upload_index[upload_key] = video_id
+            self._save_upload_index(upload_index)
+
             # 썸네일 업로드
             if thumbnail_file and os.path.exists(thumbnail_file):
                 self._upload_thumbnail(video_id, thumbnail_file)
@@ -163,8 +266,37 @@ class YouTubeUploader:
                 'error': str(e)
             }
 
+    @staticmethod
+    def _file_sha256(path: str, block_size: int = 1024 * 1024) -> str:
+        """파일 내용의 SHA-256 (1MB씩 읽어 메모리 사용 최소화)"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _load_upload_index(self) -> dict:
+        """업로드 기록 로드 (없거나 손상되었으면 빈 기록)"""
+        try:
+            with open(self.index_file, 'rb') as f:
+                return orjson.loads(f.read())
+        except (OSError, ValueError):
+            return {}
+
+    def _save_upload_index(self, upload_index: dict):
+        """업로드 기록 저장 (임시 파일 후 교체)"""
+        tmp_file = f"{self.index_file}.tmp"
+        try:
+            with open(tmp_file, 'wb') as f:
+                f.write(orjson.dumps(upload_index, option=orjson.OPT_INDENT_2))
+            os.replace(tmp_file, self.index_file)
+        except OSError as e:
+            print(f"  업로드 기록 저장 실패: {e}")
+
     def _upload_thumbnail(self, video_id: str, thumbnail_file: str):
         """썸네일 이미지 업로드"""
+        from googleapiclient.http import MediaFileUpload
+
         try:
             self.youtube.thumbnails().set(
                 videoId=video_id,
@@ -242,26 +374,29 @@ class YouTubeUploader:
             return []
 
         try:
-            # 내 채널 정보 가져오기
-            channels = self.youtube.channels().list(
-                part='contentDetails',
-                mine=True
-            ).execute()
+            # 내 채널의 업로드 재생목록 ID (바뀌지 않으므로 처음 한 번만 조회)
+            if self.uploads_playlist_id is None:
+                channels = self.youtube.channels().list(
+                    part='contentDetails',
+                    mine=True,
+                    fields='items/contentDetails/relatedPlaylists/uploads'
+                ).execute()
 
-            if not channels['items']:
-                return []
+                if not channels.get('items'):
+                    return []
 
-            uploads_playlist_id = channels['items'][0]['contentDetails']['relatedPlaylists']['uploads']
+                self.uploads_playlist_id = channels['items'][0]['contentDetails']['relatedPlaylists']['uploads']
 
-            # 업로드 영상 목록 가져오기
+            # 업로드 영상 목록 가져오기 (사용하는 필드만 요청)
             playlist_items = self.youtube.playlistItems().list(
                 part='snippet',
-                playlistId=uploads_playlist_id,
-                maxResults=max_results
+                playlistId=self.uploads_playlist_id,
+                maxResults=max_results,
+                fields='items/snippet(title,description,publishedAt,resourceId/videoId)'
             ).execute()
 
             videos = []
-            for item in playlist_items['items']:
+            for item in playlist_items.get('items', []):
                 videos.append({
                     'video_id': item['snippet']['resourceId']['videoId'],
                     'title': item['snippet']['title'],
@@ -314,7 +449,7 @@ if __name__ == "__main__":
     # 1. 즉시 업로드
     print("\n1️⃣ 즉시 업로드 테스트")
     result = uploader.upload_video(**video_info)
-    print(f"\n결과: {json.dumps(result, indent=2, ensure_ascii=False)}")
+    print(f"\n결과: {orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()}")
 
     # 2. 예약 업로드 (내일 오후 6시)
     print("\n2️⃣ 예약 업로드 테스트")
@@ -324,7 +459,7 @@ if __name__ == "__main__":
     video_info['title'] = '[예약] 내일 공개될 중요한 뉴스'
     video_info['privacy_status'] = 'private'
     result = uploader.upload_video(**video_info, publish_at=tomorrow_6pm)
-    print(f"\n결과: {json.dumps(result, indent=2, ensure_ascii=False)}")
+    print(f"\n결과: {orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()}")
 
     # 3. 내 영상 목록 조회
     print("\n3️⃣ 최근 업로드 영상 목록")